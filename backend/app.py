@@ -20,6 +20,8 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from src.api import search_router, health_router, chat_router
+from src.api.chat import rag_service
+from src.services.postgres_service import PostgresService
 
 # Configure logging
 logging.basicConfig(
@@ -37,12 +39,19 @@ async def lifespan(app: FastAPI):
     """Manage application lifespan."""
     # Startup
     logger.info("Starting RAG Backend Server...")
+    try:
+        # Open the PostgreSQL pool before the first request arrives
+        await PostgresService().get_pool()
+    except Exception as e:
+        logger.error(f"PostgreSQL pool not ready at startup, will retry on first request: {e}")
     logger.info("Backend server startup complete!")
     
     yield
     
     # Shutdown
     logger.info("Shutting down backend server...")
+    await rag_service.close()
+    await PostgresService().close()
     logger.info("Backend server shutdown complete!")
 
 # Create FastAPI app
@@ -76,6 +85,7 @@ async def root():
         "description": "Now with full RAG capabilities!",
         "endpoints": {
             "chat": "/api/v1/chat",
+            "chat_stream": "/api/v1/chat/stream",
             "search": "/api/v1/search", 
             "stats": "/api/v1/stats",
             "health": "/api/v1/health",
@@ -3,7 +3,8 @@ Chat API endpoints for RAG-powered conversations.
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
+import json
 import logging
 
 from src.models.search import ChatRequest, ChatResponse, ConversationRequest, ExportRequest
@@ -59,6 +60,21 @@ async def chat_with_papers_get(
         logger.error(f"Chat request failed: {e}")
         raise HTTPException(status_code=500, detail=f"Chat request failed: {e}")
 
+@router.post("/chat/stream")
+async def chat_with_papers_stream(request: ConversationRequest):
+    """Chat with papers, streaming the answer as newline-delimited JSON events."""
+    async def event_stream():
+        async for event in rag_service.generate_response_stream(
+            query=request.query,
+            conversation_id=request.conversation_id,
+            n_results=request.n_results,
+            search_type=request.search_type,
+            max_context_messages=request.max_context_messages
+        ):
+            yield json.dumps(event, default=str) + "\n"
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
 @router.get("/chat/history/{conversation_id}")
 async def get_conversation_history(
     conversation_id: str,
@@ -0,0 +1,14 @@
+"""
+Helpers for arXiv identifiers.
+"""
+
+from typing import Optional
+
+
+def arxiv_year(doc_id: str) -> Optional[int]:
+    """Submission year from an arXiv id (0704.1224 or astro-ph/0701001)."""
+    number = doc_id.rsplit('/', 1)[-1]
+    if len(number) < 4 or not number[:2].isdigit():
+        return None
+    year = int(number[:2])
+    return year + 2000 if year < 50 else year + 1900
@@ -20,6 +20,9 @@ class Config:
     # Hardcoded database settings (safe to hardcode)
     DB_PORT = 5432
     DB_NAME = "arxiv"
+    DB_POOL_MIN_SIZE = 4
+    DB_POOL_MAX_SIZE = 20
+    DB_STATEMENT_CACHE_SIZE = 100
     
     # Hardcoded data processing settings
     BATCH_SIZE = 1000
@@ -38,9 +41,13 @@ class Config:
     EMBEDDING_BATCH_SIZE = 32
     EMBEDDING_NORMALIZE_VECTORS = True
     EMBEDDING_VECTOR_DIMENSION = 384
+    EMBEDDING_CACHE_SIZE = 4096
+    EMBEDDING_BATCH_WINDOW = 0.005  # Seconds to collect concurrent queries into one batch
     
     # Hardcoded FAISS settings
-    FAISS_INDEX_TYPE = "IndexFlatIP"
+    FAISS_INDEX_TYPE = "IndexFlatIP"  # IndexFlatIP, HNSW, IVFPQFastScan, SQ8
+    FAISS_NPROBE = 32  # Inverted lists scanned per query for IVF indexes
+    FAISS_FILTER_MAX_FRACTION = 0.5  # Skip inferred category filters matching more of the index
     FAISS_METADATA_FILE = "processed_data/faiss_metadata.jsonl"
     FAISS_INDEX_FILE = "processed_data/faiss_index.bin"
     
@@ -51,9 +58,10 @@ class Config:
     PINECONE_ENVIRONMENT = "us-east-1-aws"
     PINECONE_INDEX_NAME = "arxiv-papers"
     PINECONE_DIMENSION = 384
-    PINECONE_METRIC = "cosine"
+    PINECONE_METRIC = "dotproduct"  # Stored and query vectors are L2-normalized
     PINECONE_CLOUD = "aws"
     PINECONE_REGION = "us-east-1"
+    PINECONE_NAMESPACE_BY = None  # None, "year" or a chunk field; must match how vectors were upserted
     
     # OpenAI/LLM settings (only API key from environment)
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -63,6 +71,17 @@ class Config:
     OPENAI_MAX_TOKENS = 800
     OPENAI_TEMPERATURE = 0.5
     OPENAI_TIMEOUT = 15
+    OPENAI_BASE_URL = "https://api.openai.com/v1"
+    OPENAI_HTTP_MAX_CONNECTIONS = 256
+    OPENAI_HTTP_MAX_CONNECTIONS_PER_HOST = 128
+    # Account quotas (requests wait rather than hit 429s), split evenly across uvicorn
+    # worker processes: each worker runs its own limiter and may only spend its share
+    WEB_CONCURRENCY = max(1, int(os.getenv('WEB_CONCURRENCY', '1')))
+    OPENAI_TOKENS_PER_MINUTE = 150000 // WEB_CONCURRENCY
+    OPENAI_REQUESTS_PER_MINUTE = 1000 // WEB_CONCURRENCY
+    OPENAI_MAX_CONCURRENCY = 32
+    OPENAI_MAX_RETRIES = 5
+    OPENAI_RETRY_MAX_WAIT = 30
     
     # Azure OpenAI settings (only sensitive values from environment)
     AZURE_OPENAI_ENDPOINT = os.getenv('AZURE_OPENAI_ENDPOINT')
@@ -73,6 +92,12 @@ class Config:
     AZURE_OPENAI_DEPLOYMENT = "gpt-4o"
     USE_AZURE_OPENAI = os.getenv('USE_AZURE_OPENAI', 'true').lower() == 'true'  # Default to Azure
     
+    # Hardcoded RAG response cache settings
+    RAG_CACHE_MAX_SIZE = 512
+    RAG_SEMANTIC_CACHE_THRESHOLD = 0.97  # Cosine similarity for reusing a prior answer
+    RAG_HEALTH_CACHE_TTL = 30  # Seconds a health check result is reused
+    RAG_CONTEXT_MAX_CHARS = 12000  # Paper context budget (~3k tokens) before low-score papers are dropped
+    
     @classmethod
     def get_database_config(cls) -> Dict[str, Any]:
         """Get database configuration as dictionary."""
@@ -48,6 +48,7 @@ class ChatResponse(BaseModel):
     context_used: Optional[bool] = None
     guardrails_triggered: Optional[bool] = None
     validation_reason: Optional[str] = None
+    cached: Optional[bool] = None
 
 class ConversationMessage(BaseModel):
     id: Optional[int] = None
@@ -20,23 +20,119 @@ import json
 import psycopg2
 import psycopg2.extras
 import re
+import io
 import logging
-from datetime import datetime
+import logging.handlers
+import queue
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import argparse
 from tqdm import tqdm
+import multiprocessing
 import os
+import shutil
+import threading
+import time
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('data_ingestion_postgres.log'),
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.json as pa_json
+    # Streaming (block-at-a-time) reads need pyarrow >= 11
+    ARROW_AVAILABLE = hasattr(pa_json, 'open_json')
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# orjson parses bytes directly; the stdlib parser also accepts UTF-8 bytes
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Bytes of JSON text handed to each pyarrow parse block
+ARROW_BLOCK_SIZE = 64 << 20
+
+# Fields read from the ArXiv snapshot. An explicit schema keeps ids such as
+# "0704.0001" as strings instead of letting type inference turn them into floats.
+ARXIV_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('submitter', pa.string()),
+    ('authors', pa.string()),
+    ('title', pa.string()),
+    ('comments', pa.string()),
+    ('journal-ref', pa.string()),
+    ('doi', pa.string()),
+    ('categories', pa.string()),
+    ('license', pa.string()),
+    ('abstract', pa.string()),
+    ('versions', pa.list_(pa.struct([('version', pa.string()), ('created', pa.string())]))),
+    ('update_date', pa.string()),
+    ('authors_parsed', pa.list_(pa.list_(pa.string())))
+]) if ARROW_AVAILABLE else None
+
+# Block size for the newline-counting pass
+COUNT_BLOCK_SIZE = 16 << 20
+
+# Page-cache hints for the forward-only scan (not available on Windows/macOS)
+FADVISE_AVAILABLE = hasattr(os, 'posix_fadvise')
+# Bytes read between dropping already-parsed pages from the page cache
+DROP_CACHE_EVERY = 64 << 20
+
+# Background readahead: chunk size and number of chunks kept in flight
+READAHEAD_CHUNK_SIZE = 4 << 20
+READAHEAD_DEPTH = 4
+
+# Seconds between progress log lines during ingestion
+PROGRESS_LOG_INTERVAL = 30
+# Weight of the newest interval in the smoothed ingest rate
+PROGRESS_RATE_ALPHA = 0.3
+# Skip a progress report when the projected finish time moved less than this fraction of the ETA
+PROGRESS_ETA_TOLERANCE = 0.01
+
+# Shared processed-paper counter, installed in pool workers by _init_worker
+_worker_progress = None
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+def _log_handlers() -> List[logging.Handler]:
+    """Create the handlers that write log records to disk and the console."""
+    # File writes are buffered and only forced out by errors or a full buffer
+    file_handler = logging.handlers.RotatingFileHandler('data_ingestion_postgres.log',
+                                                        maxBytes=64 << 20, backupCount=3)
+    return [
+        logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler),
         logging.StreamHandler()
     ]
-)
+
+# Queue feeding the log listener, set by setup_logging and handed to pool workers
+_log_queue = None
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Send log records through one queue to a listener that owns the log handlers.
+    
+    Records are formatted by the QueueHandler and written by the listener thread,
+    so the ingest loop never waits on a disk flush. Pool workers log into the
+    same queue, so only this process opens the log file.
+    
+    Returns:
+        The started listener; stop it to write out the remaining records
+    """
+    global _log_queue
+    _log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(_log_queue, *_log_handlers())
+    listener.start()
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[logging.handlers.QueueHandler(_log_queue)],
+        force=True
+    )
+    return listener
+
 logger = logging.getLogger(__name__)
 
 
@@ -99,6 +195,97 @@ class TextNormalizer:
         }
 
 
+# Columns written by PostgreSQLManager.insert_papers_batch, in COPY order
+PAPER_COLUMNS = (
+    'id', 'title', 'authors', 'abstract', 'body', 'version', 'total_versions',
+    'first_created', 'last_updated', 'update_date', 'categories', 'doi',
+    'journal_ref', 'comments', 'license', 'submitter', 'authors_parsed', 'processed_timestamp'
+)
+
+def _copy_value(value: Any) -> str:
+    """Render a value as a field of COPY's text format."""
+    if value is None:
+        return '\\N'
+    text = value if isinstance(value, str) else str(value)
+    return text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+class ReadAhead:
+    """Iterate the lines of a byte range while a background thread reads ahead."""
+    
+    def __init__(self, path: Path, start: int = 0, end: Optional[int] = None,
+                 chunk_size: int = READAHEAD_CHUNK_SIZE, depth: int = READAHEAD_DEPTH):
+        """
+        Start reading a byte range of a file.
+        
+        Args:
+            path: File to read
+            start: Byte offset of the first line
+            end: Byte offset to stop at, or None to read to the end of the file
+            chunk_size: Bytes per read
+            depth: Chunks buffered ahead of the consumer
+        """
+        self.path = path
+        self.start = start
+        self.end = end
+        self.chunk_size = chunk_size
+        self._chunks = queue.Queue(maxsize=depth)
+        self._closed = False
+        # File reads release the GIL, so the disk stays busy while lines are parsed
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+    
+    def _fill(self):
+        """Read chunks into the queue, ending with None (or the error raised)."""
+        try:
+            with open(self.path, 'rb', buffering=0) as f:
+                fd = f.fileno()
+                if FADVISE_AVAILABLE:
+                    # Ask for aggressive readahead over this range
+                    length = self.end - self.start if self.end is not None else 0
+                    os.posix_fadvise(fd, self.start, length, os.POSIX_FADV_SEQUENTIAL)
+                f.seek(self.start)
+                position = dropped = self.start
+                while not self._closed:
+                    size = self.chunk_size if self.end is None else min(self.chunk_size, self.end - position)
+                    chunk = f.read(size) if size > 0 else b''
+                    if not chunk:
+                        break
+                    position += len(chunk)
+                    if FADVISE_AVAILABLE and position - dropped >= DROP_CACHE_EVERY:
+                        # The bytes are copied out already; let the kernel reclaim the pages now
+                        os.posix_fadvise(fd, dropped, position - dropped, os.POSIX_FADV_DONTNEED)
+                        dropped = position
+                    self._chunks.put(chunk)
+            self._chunks.put(None)
+        except Exception as e:
+            self._chunks.put(e)
+    
+    def __iter__(self):
+        """Yield each line of the range without its trailing newline."""
+        pending = b''
+        while True:
+            chunk = self._chunks.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            lines = (pending + chunk if pending else chunk).split(b'\n')
+            pending = lines.pop()
+            yield from lines
+        if pending:
+            yield pending
+    
+    def close(self):
+        """Stop the reader thread if the consumer finishes early."""
+        self._closed = True
+        while self._thread.is_alive():
+            try:
+                self._chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
 class PostgreSQLManager:
     """Handles PostgreSQL database operations."""
     
@@ -175,14 +362,33 @@ class PostgreSQLManager:
                 "CREATE INDEX IF NOT EXISTS idx_papers_update_date ON papers (update_date)",
                 "CREATE INDEX IF NOT EXISTS idx_papers_version ON papers (version)",
                 "CREATE INDEX IF NOT EXISTS idx_papers_total_versions ON papers (total_versions)",
-                "CREATE INDEX IF NOT EXISTS idx_papers_processed_timestamp ON papers (processed_timestamp)",
-                "CREATE INDEX IF NOT EXISTS idx_papers_title_gin ON papers USING GIN (to_tsvector('english', title))",
-                "CREATE INDEX IF NOT EXISTS idx_papers_abstract_gin ON papers USING GIN (to_tsvector('english', abstract))"
+                "CREATE INDEX IF NOT EXISTS idx_papers_processed_timestamp ON papers (processed_timestamp)"
             ]
             
             for index_sql in indexes:
                 self.cursor.execute(index_sql)
             
+            # Full-text search reads one stored tsvector; PDF processing fills full_text later
+            search_sql = [
+                "ALTER TABLE papers ADD COLUMN IF NOT EXISTS full_text TEXT",
+                """
+                ALTER TABLE papers ADD COLUMN IF NOT EXISTS search_tsv tsvector
+                GENERATED ALWAYS AS (
+                    to_tsvector('english',
+                                COALESCE(title, '') || ' ' ||
+                                COALESCE(abstract, '') || ' ' ||
+                                COALESCE(full_text, ''))
+                ) STORED
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_papers_search_tsv ON papers USING GIN (search_tsv)",
+                # Superseded by idx_papers_search_tsv
+                "DROP INDEX IF EXISTS idx_papers_title_gin",
+                "DROP INDEX IF EXISTS idx_papers_abstract_gin"
+            ]
+            
+            for search_ddl in search_sql:
+                self.cursor.execute(search_ddl)
+            
             self.connection.commit()
             logger.info("Database tables and indexes created successfully")
             
@@ -193,16 +399,31 @@ class PostgreSQLManager:
     def insert_papers_batch(self, papers: List[Dict]):
         """Insert a batch of papers into the database."""
         try:
-            insert_sql = """
-                INSERT INTO papers (
-                    id, title, authors, abstract, body, version, total_versions,
-                    first_created, last_updated, update_date, categories, doi,
-                    journal_ref, comments, license, submitter, authors_parsed, processed_timestamp
-                ) VALUES (
-                    %(id)s, %(title)s, %(authors)s, %(abstract)s, %(body)s, %(version)s, %(total_versions)s,
-                    %(first_created)s, %(last_updated)s, %(update_date)s, %(categories)s, %(doi)s,
-                    %(journal_ref)s, %(comments)s, %(license)s, %(submitter)s, %(authors_parsed)s::jsonb, %(processed_timestamp)s
-                )
+            columns = ', '.join(PAPER_COLUMNS)
+            
+            # Session-local staging table: temp tables skip the WAL, and rows are
+            # cleared automatically when each batch commits
+            self.cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS papers_staging
+                (LIKE papers INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+            """)
+            # Bulk-load data is re-derivable from the snapshot; don't wait for the WAL flush
+            self.cursor.execute("SET LOCAL synchronous_commit = off")
+            
+            # Stream the whole batch with one COPY instead of per-row INSERT parsing
+            buffer = io.StringIO()
+            for paper in papers:
+                buffer.write('\t'.join(_copy_value(paper[column]) for column in PAPER_COLUMNS))
+                buffer.write('\n')
+            buffer.seek(0)
+            self.cursor.copy_expert(f"COPY papers_staging ({columns}) FROM STDIN", buffer)
+            
+            # ON CONFLICT cannot update one row twice in a statement; keep the last copy
+            # of a repeated id (staging is emptied each commit, so ctid follows COPY order)
+            self.cursor.execute(f"""
+                INSERT INTO papers ({columns})
+                SELECT DISTINCT ON (id) {columns} FROM papers_staging
+                ORDER BY id, ctid DESC
                 ON CONFLICT (id) DO UPDATE SET
                     title = EXCLUDED.title,
                     authors = EXCLUDED.authors,
@@ -219,11 +440,9 @@ class PostgreSQLManager:
                     comments = EXCLUDED.comments,
                     license = EXCLUDED.license,
                     submitter = EXCLUDED.submitter,
-                    authors_parsed = EXCLUDED.authors_parsed::jsonb,
+                    authors_parsed = EXCLUDED.authors_parsed,
                     processed_timestamp = EXCLUDED.processed_timestamp
-            """
-            
-            self.cursor.executemany(insert_sql, papers)
+            """)
             self.connection.commit()
             
         except Exception as e:
@@ -278,7 +497,8 @@ class ArxivDataProcessor:
     """Main class for processing ArXiv metadata with PostgreSQL."""
     
     def __init__(self, input_file: str, output_dir: str = "processed_data",
-                 db_config: Dict[str, Any] = None, export_json: bool = True):
+                 db_config: Dict[str, Any] = None, export_json: bool = True,
+                 progress: Optional[Any] = None):
         """
         Initialize the processor.
         
@@ -287,6 +507,7 @@ class ArxivDataProcessor:
             output_dir: Directory to store processed data
             db_config: PostgreSQL connection configuration
             export_json: Whether to export processed data to JSONL files
+            progress: Shared multiprocessing.Value counting inserted papers across processes
         """
         self.input_file = Path(input_file)
         self.output_dir = Path(output_dir)
@@ -296,14 +517,30 @@ class ArxivDataProcessor:
         self.export_json = export_json
         
         # Initialize PostgreSQL manager
-        db_config = db_config or {}
-        self.db_manager = PostgreSQLManager(**db_config)
+        self.db_config = db_config or {}
+        self.db_manager = PostgreSQLManager(**self.db_config)
         
         # Initialize counters
         self.processed_count = 0
         self.error_count = 0
         self.skipped_count = 0
         
+        # Updated once per inserted batch and read by the progress timer,
+        # so the per-record loop never touches shared state
+        self.progress = progress if progress is not None else multiprocessing.Value('q', 0)
+        self._progress_timer = None
+        # Stop flag checked under the lock before each reschedule, so a report already
+        # running when the timer is stopped cannot start a new one
+        self._progress_stop = threading.Event()
+        self._progress_lock = threading.Lock()
+        
+        # Progress reporting state: total lines (when known) and the smoothed rate
+        self.total_records: Optional[int] = None
+        self._last_report = None
+        self._last_processed = 0
+        self._ewma_rate: Optional[float] = None
+        self._projected_finish: Optional[float] = None
+        
     def process_paper(self, paper_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Process a single paper record.
@@ -393,12 +630,217 @@ class ArxivDataProcessor:
             self.error_count += 1
             return None
     
-    def process_file_streaming(self, batch_size: int = 1000) -> None:
+    def process_range(self, start: int, end: Optional[int], batch_size: int,
+                      jsonl_output: Optional[Path] = None, pbar: Optional[tqdm] = None) -> None:
+        """
+        Process the lines that start within a byte range of the input file.
+        
+        Args:
+            start: Byte offset of the first line (must be the start of a line)
+            end: Byte offset to stop at, or None to read to the end of the file
+            batch_size: Number of records to insert per transaction
+            jsonl_output: JSONL file to append processed records to, if any
+            pbar: Progress bar to advance once per line, if any
+        """
+        batch = []
+        
+        # Raw byte lines go to the parser without a separate decode step
+        reader = ReadAhead(self.input_file, start, end)
+        try:
+            for line_num, line in enumerate(reader, 1):
+                try:
+                    # Parse JSON line
+                    paper_data = _json_loads(line.strip())
+                    
+                    batch = self._add_to_batch(paper_data, batch, batch_size, jsonl_output)
+                    
+                    if pbar is not None:
+                        pbar.update(1)
+                
+                except json.JSONDecodeError as e:
+                    logger.error(f"JSON decode error at line {line_num} (from byte {start}): {str(e)}")
+                    self.error_count += 1
+                    continue
+                except Exception as e:
+                    logger.error(f"Unexpected error at line {line_num} (from byte {start}): {str(e)}")
+                    self.error_count += 1
+                    continue
+        finally:
+            reader.close()
+        
+        # Process remaining batch
+        if batch:
+            self._flush_batch(batch)
+    
+    def process_arrow(self, batch_size: int, jsonl_output: Optional[Path] = None,
+                      pbar: Optional[tqdm] = None) -> bool:
+        """
+        Process the whole input file with pyarrow's multithreaded JSON reader.
+        
+        Blocks of the file are parsed in C against ARXIV_SCHEMA, so only the
+        per-paper normalization runs in Python. pyarrow rejects a whole block on
+        any malformed line; in that case the counters and JSONL export are rolled
+        back (inserts are upserts, so rows already written are simply rewritten)
+        and the caller falls back to line-by-line parsing.
+        
+        Args:
+            batch_size: Number of records to insert per transaction
+            jsonl_output: JSONL file to append processed records to, if any
+            pbar: Progress bar to advance once per parsed block, if any
+            
+        Returns:
+            True if the file was processed, False if the caller should fall back
+        """
+        checkpoint = (self.processed_count, self.error_count, self.skipped_count, self.progress.value)
+        export_size = jsonl_output.stat().st_size if jsonl_output and jsonl_output.exists() else 0
+        batch = []
+        
+        try:
+            reader = pa_json.open_json(
+                str(self.input_file),
+                read_options=pa_json.ReadOptions(block_size=ARROW_BLOCK_SIZE),
+                parse_options=pa_json.ParseOptions(explicit_schema=ARXIV_SCHEMA,
+                                                   unexpected_field_behavior='ignore')
+            )
+            for record_batch in reader:
+                for paper_data in record_batch.to_pylist():
+                    try:
+                        batch = self._add_to_batch(paper_data, batch, batch_size, jsonl_output)
+                    except Exception as e:
+                        logger.error(f"Unexpected error for paper {paper_data.get('id', 'unknown')}: {str(e)}")
+                        self.error_count += 1
+                if pbar is not None:
+                    pbar.update(record_batch.num_rows)
+        except pa.ArrowInvalid as e:
+            logger.warning(f"Arrow JSON reader failed ({e}); falling back to line-by-line parsing")
+            self.processed_count, self.error_count, self.skipped_count, progress = checkpoint
+            with self.progress.get_lock():
+                self.progress.value = progress
+            if jsonl_output and jsonl_output.exists():
+                os.truncate(jsonl_output, export_size)
+            if pbar is not None:
+                pbar.reset()
+            return False
+        
+        # Process remaining batch
+        if batch:
+            self._flush_batch(batch)
+        return True
+    
+    def _add_to_batch(self, paper_data: Dict[str, Any], batch: List[Dict],
+                      batch_size: int, jsonl_output: Optional[Path]) -> List[Dict]:
+        """
+        Process one raw record into the pending batch, inserting it once full.
+        
+        Args:
+            paper_data: Raw paper data from JSON
+            batch: Processed papers not yet inserted
+            batch_size: Number of records to insert per transaction
+            jsonl_output: JSONL file to append processed records to, if any
+            
+        Returns:
+            The pending batch (emptied after an insert)
+        """
+        # Process paper
+        processed_paper = self.process_paper(paper_data)
+        
+        if processed_paper:
+            batch.append(processed_paper)
+            self.processed_count += 1
+            
+            # Write to JSONL (only if export is enabled)
+            if jsonl_output:
+                with open(jsonl_output, 'a', encoding='utf-8') as jsonl_file:
+                    jsonl_file.write(json.dumps(processed_paper, default=str, ensure_ascii=False) + '\n')
+        
+        # Process batch when it reaches batch_size
+        if len(batch) >= batch_size:
+            self._flush_batch(batch)
+        
+        return batch
+    
+    def _flush_batch(self, batch: List[Dict]) -> None:
+        """
+        Insert the pending batch and empty it, even if the insert fails.
+        
+        A failed batch is dropped (the manager logs it) instead of being retried,
+        and growing, with every record that follows.
+        
+        Args:
+            batch: Processed papers not yet inserted; cleared in place
+        """
+        try:
+            self.db_manager.insert_papers_batch(batch)
+            self._add_progress(len(batch))
+        finally:
+            batch.clear()
+    
+    def _add_progress(self, count: int) -> None:
+        """Add inserted papers to the shared progress counter."""
+        with self.progress.get_lock():
+            self.progress.value += count
+    
+    def _report_progress(self) -> None:
+        """Log progress with a smoothed rate and ETA, then schedule the next report."""
+        now = time.monotonic()
+        processed = self.progress.value
+        
+        # Exponentially weighted rate tracks current throughput rather than the run average
+        elapsed = now - self._last_report
+        if elapsed > 0:
+            instant = (processed - self._last_processed) / elapsed
+            self._ewma_rate = instant if self._ewma_rate is None else (
+                (1 - PROGRESS_RATE_ALPHA) * self._ewma_rate + PROGRESS_RATE_ALPHA * instant)
+        self._last_report, self._last_processed = now, processed
+        
+        eta = None
+        if self.total_records and self._ewma_rate:
+            eta = max(self.total_records - processed, 0) / self._ewma_rate
+        
+        # Only report when the estimate actually changed
+        finish = now + eta if eta is not None else None
+        previous = self._projected_finish
+        self._projected_finish = finish
+        if finish is None or previous is None or abs(finish - previous) >= PROGRESS_ETA_TOLERANCE * max(eta, 1):
+            lines = [f"Processed {processed} papers so far..."]
+            if self._ewma_rate is not None:
+                lines.append(f"  Rate: {self._ewma_rate:.0f} papers/s")
+            if eta is not None:
+                lines.append(f"  ETA: {timedelta(seconds=int(eta))}")
+            logger.info("\n".join(lines))
+        
+        with self._progress_lock:
+            if not self._progress_stop.is_set():
+                self._schedule_progress_report()
+    
+    def _schedule_progress_report(self) -> None:
+        """Schedule a progress report PROGRESS_LOG_INTERVAL seconds from now."""
+        self._progress_timer = threading.Timer(PROGRESS_LOG_INTERVAL, self._report_progress)
+        self._progress_timer.daemon = True
+        self._progress_timer.start()
+    
+    def _start_progress_timer(self) -> None:
+        """Start periodic progress reports."""
+        with self._progress_lock:
+            self._progress_stop.clear()
+            self._schedule_progress_report()
+    
+    def _stop_progress_timer(self) -> None:
+        """Stop periodic progress reports and cancel any pending one."""
+        with self._progress_lock:
+            self._progress_stop.set()
+            timer, self._progress_timer = self._progress_timer, None
+        if timer is not None:
+            timer.cancel()
+    
+    def process_file_streaming(self, batch_size: int = 1000, workers: int = 1, use_arrow: bool = False) -> None:
         """
         Process the input file in streaming mode to handle large files.
         
         Args:
             batch_size: Number of records to process in each batch
+            workers: Number of processes, each ingesting its own byte range of the file
+            use_arrow: Parse with pyarrow's block reader (serial mode only)
         """
         logger.info(f"Starting to process {self.input_file}")
         
@@ -411,77 +853,173 @@ class ArxivDataProcessor:
         if self.export_json:
             jsonl_output = self.output_dir / "arxiv_processed.jsonl"
         
-        batch = []
+        if use_arrow and not ARROW_AVAILABLE:
+            logger.warning("pyarrow >= 11 is not installed; using the line-by-line reader")
+            use_arrow = False
         
-        with open(self.input_file, 'r', encoding='utf-8') as f:
-            # Get total line count for progress bar
-            total_lines = sum(1 for _ in f)
-            f.seek(0)
-            
-            with tqdm(total=total_lines, desc="Processing papers") as pbar:
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        # Parse JSON line
-                        paper_data = json.loads(line.strip())
-                        
-                        # Process paper
-                        processed_paper = self.process_paper(paper_data)
-                        
-                        if processed_paper:
-                            batch.append(processed_paper)
-                            self.processed_count += 1
-                            
-                            # Write to JSONL (only if export is enabled)
-                            if self.export_json and jsonl_output:
-                                with open(jsonl_output, 'a', encoding='utf-8') as jsonl_file:
-                                    jsonl_file.write(json.dumps(processed_paper, default=str, ensure_ascii=False) + '\n')
-                        
-                        # Process batch when it reaches batch_size
-                        if len(batch) >= batch_size:
-                            self.db_manager.insert_papers_batch(batch)
-                            batch = []
-                        
-                        pbar.update(1)
-                        
-                        # Log progress every 10000 records
-                        if self.processed_count % 10000 == 0:
-                            logger.info(f"Processed {self.processed_count} papers so far...")
-                    
-                    except json.JSONDecodeError as e:
-                        logger.error(f"JSON decode error at line {line_num}: {str(e)}")
-                        self.error_count += 1
-                        continue
-                    except Exception as e:
-                        logger.error(f"Unexpected error at line {line_num}: {str(e)}")
-                        self.error_count += 1
-                        continue
-                
-                # Process remaining batch
-                if batch:
-                    self.db_manager.insert_papers_batch(batch)
+        # Get total line count for the progress bar and ETA
+        self.total_records = count_lines(self.input_file)
+        logger.info(f"Input has {self.total_records} lines")
+        
+        self._last_report = time.monotonic()
+        self._last_processed = self.progress.value
+        self._start_progress_timer()
+        try:
+            if workers > 1:
+                if use_arrow:
+                    logger.warning("The Arrow reader only runs serially; ignoring it for the parallel ingest")
+                self._process_parallel(batch_size, workers, jsonl_output)
+            else:
+                with tqdm(total=self.total_records, desc="Processing papers") as pbar:
+                    if not (use_arrow and self.process_arrow(batch_size, jsonl_output, pbar)):
+                        self.process_range(0, None, batch_size, jsonl_output, pbar)
+        finally:
+            self._stop_progress_timer()
         
         # Get final statistics
         stats = self.db_manager.get_statistics()
         
-        # Final statistics
-        logger.info(f"Processing completed!")
-        logger.info(f"Total processed: {self.processed_count}")
-        logger.info(f"Errors: {self.error_count}")
-        logger.info(f"Skipped: {self.skipped_count}")
-        logger.info(f"Database total papers: {stats.get('total_papers', 0)}")
-        logger.info(f"Output files:")
+        # Final statistics, emitted as one multi-line record
+        summary = [
+            "Processing completed!",
+            f"Total processed: {self.processed_count}",
+            f"Errors: {self.error_count}",
+            f"Skipped: {self.skipped_count}",
+            f"Database total papers: {stats.get('total_papers', 0)}",
+            "Output files:"
+        ]
         if self.export_json and jsonl_output:
-            logger.info(f"  JSONL: {jsonl_output}")
-        logger.info(f"  PostgreSQL: {self.db_manager.database}")
+            summary.append(f"  JSONL: {jsonl_output}")
+        summary.append(f"  PostgreSQL: {self.db_manager.database}")
         
         # Show top categories
         if stats.get('top_categories'):
-            logger.info("Top categories:")
-            for cat in stats['top_categories'][:5]:
-                logger.info(f"  {cat['categories']}: {cat['count']} papers")
+            summary.append("Top categories:")
+            summary.extend(f"  {cat['categories']}: {cat['count']} papers"
+                           for cat in stats['top_categories'][:5])
+        logger.info("\n".join(summary))
         
         # Close database connection
         self.db_manager.close()
+    
+    def _process_parallel(self, batch_size: int, workers: int, jsonl_output: Optional[Path]) -> None:
+        """
+        Fan byte ranges of the input file out to a process pool.
+        
+        Args:
+            batch_size: Number of records each worker inserts per transaction
+            workers: Number of worker processes
+            jsonl_output: Combined JSONL export file, if export is enabled
+        """
+        ranges = split_byte_ranges(self.input_file, workers)
+        logger.info(f"Ingesting {len(ranges)} byte ranges with {workers} worker processes")
+        
+        # Each worker exports to its own part file; parts are joined in file order afterwards
+        parts = [self.output_dir / f"arxiv_processed.part{i}.jsonl" if jsonl_output else None
+                 for i in range(len(ranges))]
+        tasks = [
+            (str(self.input_file), str(self.output_dir), self.db_config, start, end, batch_size, part)
+            for (start, end), part in zip(ranges, parts)
+        ]
+        
+        # Workers send log records to this process's listener, which owns the log file
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(self.progress, _log_queue)) as pool:
+            for processed, errors, skipped in tqdm(pool.imap_unordered(_ingest_range, tasks),
+                                                   total=len(tasks), desc="Processing ranges"):
+                self.processed_count += processed
+                self.error_count += errors
+                self.skipped_count += skipped
+            # Let workers exit normally so their queued log records are sent
+            pool.close()
+            pool.join()
+        
+        if jsonl_output:
+            with open(jsonl_output, 'ab') as combined:
+                for part in parts:
+                    if part.exists():
+                        with open(part, 'rb') as part_file:
+                            shutil.copyfileobj(part_file, combined)
+                        part.unlink()
+
+
+def count_lines(path: Path) -> int:
+    """
+    Count the lines in a file by scanning large blocks for newlines.
+    
+    Args:
+        path: File to count
+        
+    Returns:
+        Number of lines, including a final line without a trailing newline
+    """
+    total = 0
+    last = b'\n'
+    with open(path, 'rb', buffering=0) as f:
+        if FADVISE_AVAILABLE:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        # bytes.count runs in C over each block; no per-line Python objects
+        while True:
+            block = f.read(COUNT_BLOCK_SIZE)
+            if not block:
+                break
+            total += block.count(b'\n')
+            last = block[-1:]
+    return total + (last != b'\n')
+
+
+def split_byte_ranges(path: Path, count: int) -> List[tuple]:
+    """
+    Split a file into byte ranges whose boundaries fall on line starts.
+    
+    Args:
+        path: File to split
+        count: Desired number of ranges
+        
+    Returns:
+        List of (start, end) byte offsets covering the whole file
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, count):
+            # Move each cut forward to the start of the next line
+            f.seek(max(size * i // count, boundaries[-1]))
+            f.readline()
+            boundaries.append(min(f.tell(), size))
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+def _init_worker(progress, log_queue) -> None:
+    """Pool initializer: keep the parent's progress counter and log queue for this worker."""
+    global _worker_progress
+    _worker_progress = progress
+    
+    # Without a parent listener (library use), keep whatever logging the worker has
+    if log_queue is None:
+        return
+    
+    # The parent's log listener thread does not run in this process; hand records to the parent
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(handler)
+
+
+def _ingest_range(task: tuple) -> tuple:
+    """Worker entry point: ingest one byte range over its own database connection."""
+    input_file, output_dir, db_config, start, end, batch_size, jsonl_output = task
+    processor = ArxivDataProcessor(input_file, output_dir, db_config,
+                                   export_json=jsonl_output is not None, progress=_worker_progress)
+    processor.db_manager.connect()
+    try:
+        processor.process_range(start, end, batch_size, jsonl_output)
+    finally:
+        processor.db_manager.close()
+    return processor.processed_count, processor.error_count, processor.skipped_count
 
 
 def main():
@@ -491,6 +1029,11 @@ def main():
     parser.add_argument('--output', '-o', default='processed_data', help='Output directory')
     parser.add_argument('--batch-size', '-b', type=int, default=1000, help='Batch size for processing')
     parser.add_argument('--no-json-export', action='store_true', help='Skip JSONL file export (PostgreSQL only)')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                        help='Worker processes, each ingesting a byte range of the input over its own '
+                             'database connection (default 1 = serial)')
+    parser.add_argument('--arrow', action='store_true',
+                        help='Parse with the pyarrow JSON reader (requires pyarrow, serial mode only)')
     
     # PostgreSQL connection arguments
     parser.add_argument('--db-host', default='localhost', help='PostgreSQL host')
@@ -500,11 +1043,13 @@ def main():
     parser.add_argument('--db-password', help='PostgreSQL password (or set POSTGRES_PASSWORD env var)')
     
     args = parser.parse_args()
+    log_listener = setup_logging()
     
     # Validate input file
     input_path = Path(args.input)
     if not input_path.exists():
         logger.error(f"Input file {input_path} does not exist!")
+        log_listener.stop()
         return
     
     # Database configuration
@@ -519,7 +1064,10 @@ def main():
     # Create processor and run
     export_json = not args.no_json_export
     processor = ArxivDataProcessor(args.input, args.output, db_config, export_json)
-    processor.process_file_streaming(args.batch_size)
+    try:
+        processor.process_file_streaming(args.batch_size, args.workers, args.arrow)
+    finally:
+        log_listener.stop()
 
 
 if __name__ == "__main__":
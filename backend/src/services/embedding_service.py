@@ -2,8 +2,12 @@
 Embedding service for generating text embeddings.
 """
 
+import asyncio
 import logging
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+import numpy as np
 
 from ..core.config import Config
 from .embedding_generation import EmbeddingGenerator, EmbeddingConfig
@@ -25,6 +29,10 @@ class EmbeddingService:
     def __init__(self):
         if not hasattr(self, 'initialized'):
             self.generator = None
+            self._cache: OrderedDict = OrderedDict()  # normalized text -> read-only embedding
+            self._cache_lock = threading.Lock()
+            self._pending = []  # (key, text, future) waiting for the next micro-batch
+            self._flush_task = None
             self._initialize()
             self.initialized = True
     
@@ -48,10 +56,77 @@ class EmbeddingService:
             logger.error(f"Failed to initialize embedding service: {e}")
             raise
     
-    def generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text."""
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        """Normalize text for the embedding cache (the model's tokenizer is uncased)."""
+        return text.strip().lower()
+    
+    def _cache_get(self, key: str) -> Optional[np.ndarray]:
+        """Return a cached embedding and mark it as recently used."""
+        with self._cache_lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+            return embedding
+    
+    def _cache_put(self, key: str, embedding: np.ndarray) -> np.ndarray:
+        """Cache an embedding, evicting the least recently used entry when full."""
+        # Cached arrays are shared between callers, so make them read-only
+        embedding.setflags(write=False)
+        with self._cache_lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            if len(self._cache) > Config.EMBEDDING_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return embedding
+    
+    def generate_embedding(self, text: str) -> np.ndarray:
+        """Generate embedding for text, reusing cached embeddings of repeated text."""
+        key = self._cache_key(text)
+        embedding = self._cache_get(key)
+        if embedding is not None:
+            return embedding
+        
         try:
-            return self.generator.generate_embedding(text)
+            return self._cache_put(key, self.generator.generate_embedding(text))
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             raise
+    
+    async def embed_query(self, text: str) -> np.ndarray:
+        """Embed a query, coalescing concurrent calls into one model batch."""
+        key = self._cache_key(text)
+        embedding = self._cache_get(key)
+        if embedding is not None:
+            return embedding
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((key, text, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_pending())
+        return await future
+    
+    async def _flush_pending(self):
+        """Embed every query queued during the batching window in a single call."""
+        await asyncio.sleep(Config.EMBEDDING_BATCH_WINDOW)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+        
+        # Identical queries in the same window share one forward pass
+        texts = {}
+        for key, text, _ in batch:
+            texts.setdefault(key, text)
+        
+        try:
+            embeddings = await asyncio.to_thread(self.generator.generate_embeddings_batch, list(texts.values()))
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings for {len(texts)} queries: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        results = {key: self._cache_put(key, embedding) for key, embedding in zip(texts, embeddings)}
+        for key, _, future in batch:
+            if not future.done():
+                future.set_result(results[key])
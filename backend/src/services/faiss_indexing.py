@@ -9,6 +9,7 @@ It provides efficient similarity search and stores metadata separately for prove
 Key Features:
 - FAISS IndexFlatIP for inner product similarity
 - HNSW index for larger datasets
+- Quantized IVF-PQ4 fast-scan and int8 scalar-quantized indexes with exact FP32 re-ranking
 - Metadata storage in JSONL format
 - Batch indexing for efficiency
 - Index persistence and loading
@@ -50,7 +51,7 @@ logger = logging.getLogger(__name__)
 @dataclass
 class FAISSConfig:
     """Configuration for FAISS indexing."""
-    index_type: str = 'IndexFlatIP'  # IndexFlatIP, HNSW
+    index_type: str = 'IndexFlatIP'  # IndexFlatIP, HNSW, IVFPQFastScan, SQ8
     vector_dimension: int = 384
     metadata_file: str = None
     index_file: str = None
@@ -59,6 +60,19 @@ class FAISSConfig:
     hnsw_m: int = 16
     hnsw_ef_construction: int = 200
     hnsw_ef_search: int = 50
+    # Quantized index parameters (IVFPQFastScan, SQ8)
+    ivf_nlist: int = 4096
+    ivf_nprobe: int = None  # Defaults to Config.FAISS_NPROBE
+    pq_m: int = None  # PQ sub-quantizers (4 bits each); defaults to vector_dimension // 2
+    train_sample_size: int = 100000  # Vectors buffered to train the quantizer
+    min_train_vectors: int = 1000  # Smaller corpora fall back to an exact IndexFlatIP
+    refine: bool = True  # Re-rank candidates with exact FP32 inner products
+    refine_k_factor: float = 40.0  # Candidates re-ranked per requested result
+    
+    def __post_init__(self):
+        """Fill search parameters from global config."""
+        if self.ivf_nprobe is None:
+            self.ivf_nprobe = Config.FAISS_NPROBE
 
 
 class FAISSIndexer:
@@ -75,6 +89,8 @@ class FAISSIndexer:
         self.index = None
         self.metadata = []
         self.vector_dimension = self.config.vector_dimension
+        self._train_buffer = []  # Vectors added before a quantized index is trained
+        self._index_parts = []  # Keeps sub-indexes referenced by wrapper indexes alive
         
         # Set default file paths if not provided
         if self.config.metadata_file is None:
@@ -110,11 +126,64 @@ class FAISSIndexer:
             self.index = faiss.IndexHNSWFlat(self.vector_dimension, self.config.hnsw_m)
             self.index.hnsw.efConstruction = self.config.hnsw_ef_construction
             self.index.hnsw.efSearch = self.config.hnsw_ef_search
+        elif self.config.index_type == 'IVFPQFastScan':
+            # Inverted lists with 4-bit PQ codes scanned through SIMD lookup tables
+            quantizer = faiss.IndexFlatIP(self.vector_dimension)
+            pq_m = self.config.pq_m or self.vector_dimension // 2
+            self.index = faiss.IndexIVFPQFastScan(
+                quantizer, self.vector_dimension, self.config.ivf_nlist, pq_m, 4, faiss.METRIC_INNER_PRODUCT
+            )
+            self._index_parts = [quantizer]
+        elif self.config.index_type == 'SQ8':
+            # One byte per dimension instead of four
+            self.index = faiss.IndexScalarQuantizer(
+                self.vector_dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+            self._index_parts = []
         else:
             raise ValueError(f"Unsupported index type: {self.config.index_type}")
         
+        if self.config.index_type in ('IVFPQFastScan', 'SQ8') and self.config.refine:
+            # Keep the FP32 vectors alongside the codes to re-score the best candidates exactly
+            self._index_parts.append(self.index)
+            self.index = faiss.IndexRefineFlat(self.index)
+        
+        self._apply_search_params()
         logger.info(f"Created FAISS index: {self.index}")
     
+    def _apply_search_params(self):
+        """Set query-time parameters (nprobe, re-rank depth) on the current index."""
+        index = self.index
+        if isinstance(index, faiss.IndexRefine):
+            index.k_factor = self.config.refine_k_factor
+            index = faiss.downcast_index(index.base_index)
+        if isinstance(index, faiss.IndexIVF):
+            index.nprobe = self.config.ivf_nprobe
+    
+    def _train_and_flush(self):
+        """Train a quantized index on the buffered vectors, then add them."""
+        vectors = np.concatenate(self._train_buffer)
+        self._train_buffer = []
+        
+        # PQ training fails outright on a handful of vectors, and a flat scan is cheap at this size
+        if len(vectors) < self.config.min_train_vectors:
+            logger.warning(f"Only {len(vectors)} vectors; using IndexFlatIP instead of {self.config.index_type}")
+            self.config.index_type = 'IndexFlatIP'
+            self.create_index()
+            self.index.add(vectors)
+            return
+        
+        # IVF needs roughly 39 training points per list; shrink nlist for small corpora
+        if self.config.index_type == 'IVFPQFastScan' and len(vectors) < 39 * self.config.ivf_nlist:
+            nlist = max(1, len(vectors) // 39)
+            logger.warning(f"Only {len(vectors)} training vectors; reducing nlist from {self.config.ivf_nlist} to {nlist}")
+            self.config.ivf_nlist = nlist
+            self.create_index()
+        
+        logger.info(f"Training FAISS {self.config.index_type} index on {len(vectors)} vectors")
+        self.index.train(vectors)
+        self.index.add(vectors)
+    
     def add_vectors(self, vectors: np.ndarray, metadata: List[Dict[str, Any]]):
         """
         Add vectors and metadata to the index.
@@ -130,21 +199,34 @@ class FAISSIndexer:
         if self.config.normalize_vectors:
             faiss.normalize_L2(vectors)
         
-        # Add vectors to index
-        self.index.add(vectors.astype('float32'))
+        vectors = vectors.astype('float32')
         
-        # Store metadata
+        # Store metadata (ids follow insertion order, buffered vectors included)
         self.metadata.extend(metadata)
         
+        # Quantized indexes must be trained first: buffer a sample, then train and add it
+        if not self.index.is_trained:
+            self._train_buffer.append(vectors)
+            buffered = sum(len(batch) for batch in self._train_buffer)
+            if buffered < self.config.train_sample_size:
+                logger.info(f"Buffered {len(vectors)} vectors for training ({buffered}/{self.config.train_sample_size})")
+                return
+            self._train_and_flush()
+        else:
+            # Add vectors to index
+            self.index.add(vectors)
+        
         logger.info(f"Added {len(vectors)} vectors to index. Total vectors: {self.index.ntotal}")
     
-    def search(self, query_vector: np.ndarray, k: int = 10) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    def search(self, query_vector: np.ndarray, k: int = 10,
+               allowed_ids: Optional[np.ndarray] = None) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
         """
         Search for similar vectors.
         
         Args:
             query_vector: Query vector of shape (vector_dimension,)
             k: Number of results to return
+            allowed_ids: Optional int64 array of vector ids to restrict the search to
             
         Returns:
             Tuple of (distances, metadata_list)
@@ -157,20 +239,98 @@ class FAISSIndexer:
             query_vector = query_vector.astype('float32')
             faiss.normalize_L2(query_vector.reshape(1, -1))
             query_vector = query_vector.reshape(-1)
+        query = query_vector.reshape(1, -1).astype('float32')
         
         # Search
-        distances, indices = self.index.search(query_vector.reshape(1, -1).astype('float32'), k)
+        if allowed_ids is None:
+            distances, indices = self.index.search(query, k)
+        else:
+            distances, indices = self._search_filtered(query, k, allowed_ids)
         
-        # Get metadata for results
+        # Get metadata for results (filtered searches pad missing hits with -1)
         result_metadata = []
         for idx in indices[0]:
-            if idx < len(self.metadata):
+            if 0 <= idx < len(self.metadata):
                 result_metadata.append(self.metadata[idx])
             else:
                 result_metadata.append({})
         
         return distances[0], result_metadata
     
+    def _search_filtered(self, query: np.ndarray, k: int, allowed_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search only among allowed vector ids.
+        
+        The id selector is applied inside the index scan, so excluded vectors are
+        never scored. IndexRefine rejects search parameters, so the selector goes to
+        its base index and the candidates are re-ranked against the FP32 store here.
+        Bases that still reject parameters (IVF fast-scan) scan the FP32 store with
+        the selector instead; only unrefined fast-scan indexes filter after search.
+        
+        Args:
+            query: Query matrix of shape (1, vector_dimension)
+            k: Number of results to return
+            allowed_ids: Sorted int64 array of vector ids
+            
+        Returns:
+            Tuple of (distances, indices) shaped like Index.search output
+        """
+        allowed_ids = np.ascontiguousarray(allowed_ids, dtype='int64')
+        # IDSelectorBatch checks membership through a hash set; IDSelectorArray scans linearly
+        selector = faiss.IDSelectorBatch(len(allowed_ids), faiss.swig_ptr(allowed_ids))
+        base_index = self.index
+        refine_index = None
+        k_base = k
+        if isinstance(base_index, faiss.IndexRefine):
+            refine_index = faiss.downcast_index(base_index.refine_index)
+            k_base = int(k * base_index.k_factor)
+            base_index = faiss.downcast_index(base_index.base_index)
+        if isinstance(base_index, faiss.IndexIVF):
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=self.config.ivf_nprobe)
+        elif isinstance(base_index, faiss.IndexHNSW):
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=self.config.hnsw_ef_search)
+        else:
+            params = faiss.SearchParameters(sel=selector)
+        
+        try:
+            distances, indices = base_index.search(query, k_base, params=params)
+        except RuntimeError as e:
+            if refine_index is None:
+                logger.warning(f"Index does not support id selectors ({e}); filtering after search")
+                return self._search_post_filtered(query, k, allowed_ids)
+            # Exact scan of the FP32 store, scoring allowed ids only
+            return refine_index.search(query, k, params=faiss.SearchParameters(sel=selector))
+        
+        if refine_index is None:
+            return distances, indices
+        return self._refine_candidates(query, k, indices[0], refine_index)
+    
+    def _refine_candidates(self, query: np.ndarray, k: int, candidates: np.ndarray,
+                           refine_index) -> Tuple[np.ndarray, np.ndarray]:
+        """Re-rank base index candidates by exact inner product against the FP32 store."""
+        candidates = candidates[candidates >= 0]
+        scores = refine_index.reconstruct_batch(candidates) @ query[0]
+        order = np.argsort(-scores)[:k]
+        
+        result_distances = np.full((1, k), -np.inf, dtype='float32')
+        result_indices = np.full((1, k), -1, dtype='int64')
+        result_distances[0, :len(order)] = scores[order]
+        result_indices[0, :len(order)] = candidates[order]
+        return result_distances, result_indices
+    
+    def _search_post_filtered(self, query: np.ndarray, k: int, allowed_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Over-fetch an unfiltered search and keep only allowed ids."""
+        distances, indices = self.index.search(query, k * 10)
+        keep = np.isin(indices[0], allowed_ids)
+        kept_distances = distances[0][keep][:k]
+        kept_indices = indices[0][keep][:k]
+        
+        result_distances = np.full((1, k), -np.inf, dtype='float32')
+        result_indices = np.full((1, k), -1, dtype='int64')
+        result_distances[0, :len(kept_indices)] = kept_distances
+        result_indices[0, :len(kept_indices)] = kept_indices
+        return result_distances, result_indices
+    
     def save_index(self, index_path: str = None, metadata_path: str = None):
         """
         Save the index and metadata to disk.
@@ -182,6 +342,10 @@ class FAISSIndexer:
         if self.index is None:
             raise ValueError("No index to save. Create and populate index first.")
         
+        # Train on whatever was buffered if the sample size was never reached
+        if self._train_buffer:
+            self._train_and_flush()
+        
         index_path = index_path or self.config.index_file
         metadata_path = metadata_path or self.config.metadata_file
         
@@ -217,6 +381,7 @@ class FAISSIndexer:
         
         # Load FAISS index
         self.index = faiss.read_index(index_path)
+        self._apply_search_params()
         logger.info(f"Loaded FAISS index from {index_path}")
         
         # Load metadata
@@ -367,18 +532,20 @@ class FAISSPipeline:
         logger.info(f"Total vectors: {self.total_vectors}")
         logger.info(f"Index info: {self.indexer.get_index_info()}")
     
-    def search(self, query_vector: np.ndarray, k: int = 10) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    def search(self, query_vector: np.ndarray, k: int = 10,
+               allowed_ids: Optional[np.ndarray] = None) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
         """
         Search the index for similar vectors.
         
         Args:
             query_vector: Query vector
             k: Number of results to return
+            allowed_ids: Optional int64 array of vector ids to restrict the search to
             
         Returns:
             Tuple of (distances, metadata_list)
         """
-        return self.indexer.search(query_vector, k)
+        return self.indexer.search(query_vector, k, allowed_ids)
 
 
 def main():
@@ -388,7 +555,7 @@ def main():
     parser = argparse.ArgumentParser(description='Create FAISS index from chunks')
     parser.add_argument('--chunks-file', required=True, help='Input chunks JSONL file')
     parser.add_argument('--index-type', default='IndexFlatIP', 
-                       choices=['IndexFlatIP', 'HNSW'], help='FAISS index type')
+                       choices=['IndexFlatIP', 'HNSW', 'IVFPQFastScan', 'SQ8'], help='FAISS index type')
     parser.add_argument('--batch-size', type=int, default=1000, help='Batch size for processing')
     parser.add_argument('--vector-dimension', type=int, default=384, help='Vector dimension')
     
@@ -2,18 +2,73 @@
 FAISS service for local vector search operations.
 """
 
+import asyncio
 import logging
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 from pathlib import Path
 
 from ..models.search import SearchResult
+from ..core.arxiv import arxiv_year
 from ..core.config import Config
 from .embedding_service import EmbeddingService
 from .faiss_indexing import FAISSPipeline, FAISSConfig
+from .postgres_service import PostgresService
 
 logger = logging.getLogger(__name__)
 
+# Query keywords mapped to the arXiv categories that can answer them. Plain
+# "astro-ph" covers papers submitted before the astro-ph subcategories existed.
+_CATEGORY_KEYWORDS = {
+    "black hole": ("astro-ph", "astro-ph.HE", "astro-ph.GA", "gr-qc"),
+    "wormhole": ("gr-qc", "hep-th"),
+    "gravitational wave": ("astro-ph", "astro-ph.HE", "gr-qc"),
+    "neutron star": ("astro-ph", "astro-ph.HE", "astro-ph.SR"),
+    "pulsar": ("astro-ph", "astro-ph.HE"),
+    "gamma-ray burst": ("astro-ph", "astro-ph.HE"),
+    "supernova": ("astro-ph", "astro-ph.HE", "astro-ph.SR"),
+    "dark energy": ("astro-ph", "astro-ph.CO", "gr-qc"),
+    "dark matter": ("astro-ph", "astro-ph.CO", "astro-ph.GA", "hep-ph"),
+    "cosmic microwave background": ("astro-ph", "astro-ph.CO"),
+    "galaxy": ("astro-ph", "astro-ph.GA", "astro-ph.CO"),
+    "galaxies": ("astro-ph", "astro-ph.GA", "astro-ph.CO"),
+    "exoplanet": ("astro-ph", "astro-ph.EP"),
+}
+
+# Paper ids sent per category lookup, so no single query carries every doc_id
+_CATEGORY_FETCH_SIZE = 10000
+
+def _group_by_year(metadata: List[Dict[str, Any]]) -> Tuple[Dict[int, np.ndarray], List[str]]:
+    """Vector ids per submission year, plus the distinct doc_ids in the index."""
+    year_ids: Dict[int, List[int]] = {}
+    doc_ids = set()
+    for vector_id, meta in enumerate(metadata):
+        doc_id = meta.get('doc_id')
+        if doc_id:
+            doc_ids.add(doc_id)
+        year = arxiv_year(str(doc_id or ''))
+        if year is not None:
+            year_ids.setdefault(year, []).append(vector_id)
+    return {year: np.array(ids, dtype='int64') for year, ids in year_ids.items()}, list(doc_ids)
+
+def _group_by_keyword(metadata: List[Dict[str, Any]], rows: List[Any]) -> Dict[str, np.ndarray]:
+    """Sorted vector ids per query keyword, from (id, categories) paper rows."""
+    categories = {row['id']: (row['categories'] or '').split() for row in rows}
+    cat_ids: Dict[str, List[int]] = {}
+    for vector_id, meta in enumerate(metadata):
+        for category in categories.get(meta.get('doc_id'), ()):
+            cat_ids.setdefault(category, []).append(vector_id)
+    if not cat_ids:
+        return {}
+    
+    # Merged once here so a query with a single keyword needs no sort
+    keyword_ids = {}
+    for keyword, keyword_categories in _CATEGORY_KEYWORDS.items():
+        arrays = [np.array(cat_ids[category], dtype='int64')
+                  for category in keyword_categories if category in cat_ids]
+        keyword_ids[keyword] = np.unique(np.concatenate(arrays)) if arrays else np.empty(0, dtype='int64')
+    return keyword_ids
+
 class FAISSService:
     """Service for FAISS vector operations with caching."""
     
@@ -29,7 +84,12 @@ class FAISSService:
     def __init__(self):
         if not hasattr(self, 'initialized'):
             self.embedding_service = EmbeddingService()
+            self.postgres_service = PostgresService()
             self.pipeline = None
+            # Pre-filter maps from query keyword (via arXiv category) / submission year to FAISS vector ids
+            self._keyword_to_ids: Optional[Dict[str, np.ndarray]] = None
+            self._year_to_ids: Optional[Dict[int, np.ndarray]] = None
+            self._filter_maps_task = None
             self._initialize_pipeline()
             self.initialized = True
     
@@ -44,7 +104,7 @@ class FAISSService:
             
             # Create FAISS configuration
             config = FAISSConfig(
-                index_type='IndexFlatIP',
+                index_type=Config.FAISS_INDEX_TYPE,
                 vector_dimension=384,  # Sentence transformer dimension
                 metadata_file=Path(Config.PROCESSED_DATA_DIR) / 'faiss_metadata.jsonl',
                 index_file=Path(Config.PROCESSED_DATA_DIR) / 'faiss_index.bin',
@@ -73,33 +133,106 @@ class FAISSService:
             logger.error(f"Failed to initialize FAISS pipeline: {e}")
             self.pipeline = None
     
-    async def search(self, query: str, n_results: int) -> List[SearchResult]:
-        """Search using FAISS vector search."""
+    async def _ensure_filter_maps(self):
+        """Build the keyword and year id maps once, on first use."""
+        if self._keyword_to_ids is None:
+            # Share one in-flight build between concurrent first callers
+            if self._filter_maps_task is None:
+                self._filter_maps_task = asyncio.ensure_future(self._build_filter_maps())
+            await asyncio.shield(self._filter_maps_task)
+    
+    async def _build_filter_maps(self):
+        """Group FAISS vector ids by arXiv category and submission year."""
+        metadata = self.pipeline.indexer.metadata
+        try:
+            # The grouping loops walk every vector in Python; keep them off the event loop
+            self._year_to_ids, doc_ids = await asyncio.to_thread(_group_by_year, metadata)
+            
+            # Categories only live in PostgreSQL
+            rows = []
+            pool = await self.postgres_service.get_pool()
+            async with pool.acquire() as conn:
+                for start in range(0, len(doc_ids), _CATEGORY_FETCH_SIZE):
+                    rows.extend(await conn.fetch("SELECT id, categories FROM papers WHERE id = ANY($1::text[])",
+                                                 doc_ids[start:start + _CATEGORY_FETCH_SIZE]))
+            self._keyword_to_ids = await asyncio.to_thread(_group_by_keyword, metadata, rows)
+            
+            logger.info(f"[OK] FAISS pre-filter maps built: {len(self._keyword_to_ids)} keywords, {len(self._year_to_ids)} years")
+        except Exception as e:
+            # Leave _keyword_to_ids unset so the next filtered search retries the build
+            logger.error(f"Failed to build FAISS pre-filter maps: {e}")
+        finally:
+            self._filter_maps_task = None
+    
+    async def _infer_filter(self, query: str, date_range: Optional[Tuple[int, int]] = None) -> Optional[np.ndarray]:
+        """
+        Pick the vector ids a query can be answered from.
+        
+        Categories are inferred from astronomy keywords in the query; date_range is
+        an inclusive (first_year, last_year) pair. Returns None when nothing narrows
+        the search.
+        """
+        query_lower = query.lower()
+        keywords = [keyword for keyword in _CATEGORY_KEYWORDS if keyword in query_lower]
+        if not keywords and date_range is None:
+            return None
+        
+        await self._ensure_filter_maps()
+        
+        # Merging id arrays sorts up to every vector id; keep it off the event loop
+        return await asyncio.to_thread(self._merge_filter_ids, keywords, date_range)
+    
+    def _merge_filter_ids(self, keywords: List[str], date_range: Optional[Tuple[int, int]]) -> Optional[np.ndarray]:
+        """Combine the precomputed keyword and year id arrays into one filter."""
+        # An inferred category filter covering most of the index prunes little, and the
+        # flat index would still visit every vector to test it against the selector.
+        # date_range is an explicit constraint and always applies.
+        max_ids = Config.FAISS_FILTER_MAX_FRACTION * self.pipeline.indexer.index.ntotal
+        
+        allowed_ids = None
+        if keywords and self._keyword_to_ids:
+            arrays = [self._keyword_to_ids[keyword] for keyword in keywords]
+            keyword_ids = arrays[0] if len(arrays) == 1 else np.unique(np.concatenate(arrays))
+            if len(keyword_ids) <= max_ids:
+                allowed_ids = keyword_ids
+        
+        if date_range is not None and self._year_to_ids is not None:
+            first_year, last_year = date_range
+            arrays = [ids for year, ids in self._year_to_ids.items() if first_year <= year <= last_year]
+            year_ids = np.unique(np.concatenate(arrays)) if arrays else np.empty(0, dtype='int64')
+            allowed_ids = year_ids if allowed_ids is None else np.intersect1d(allowed_ids, year_ids, assume_unique=True)
+        
+        return allowed_ids
+    
+    async def search(self, query: str, n_results: int,
+                     query_embedding: Optional[np.ndarray] = None,
+                     date_range: Optional[Tuple[int, int]] = None) -> List[SearchResult]:
+        """Search using FAISS vector search, pre-filtered by inferred category and date_range."""
         try:
             if self.pipeline is None:
                 logger.error("FAISS pipeline not initialized")
                 return []
             
-            # Generate query embedding
-            query_embedding = self.embedding_service.generate_embedding(query)
+            # Generate query embedding (cached and batched with concurrent queries)
+            if query_embedding is None:
+                query_embedding = await self.embedding_service.embed_query(query)
             
-            # Search FAISS index
-            distances, metadata_list = self.pipeline.search(query_embedding, n_results)
+            # Index search is CPU-bound; run it off the event loop so concurrent
+            # PostgreSQL queries can proceed meanwhile
+            allowed_ids = await self._infer_filter(query, date_range)
+            distances, metadata_list = await asyncio.to_thread(
+                self.pipeline.search, query_embedding, n_results, allowed_ids
+            )
+            results = self._to_results(distances, metadata_list)
             
-            results = []
-            for i, (distance, metadata) in enumerate(zip(distances, metadata_list)):
-                if metadata:
-                    # Create SearchResult with metadata from FAISS
-                    results.append(SearchResult(
-                        paper_id=metadata.get('doc_id'),
-                        title=metadata.get('title', ''),
-                        authors=metadata.get('authors', ''),
-                        abstract=metadata.get('text', '')[:500] + "..." if len(metadata.get('text', '')) > 500 else metadata.get('text', ''),
-                        score=float(distance),
-                        search_type="faiss",
-                        chunk_id=metadata.get('chunk_id'),
-                        text=metadata.get('text', '')[:200] + "..." if len(metadata.get('text', '')) > 200 else metadata.get('text', '')
-                    ))
+            # The inferred category filter is a heuristic; widen the search if it was too narrow
+            if allowed_ids is not None and len(results) < n_results:
+                fallback_ids = await self._infer_filter("", date_range) if date_range is not None else None
+                if fallback_ids is None or len(fallback_ids) > len(allowed_ids):
+                    distances, metadata_list = await asyncio.to_thread(
+                        self.pipeline.search, query_embedding, n_results, fallback_ids
+                    )
+                    results = self._to_results(distances, metadata_list)
             
             return results
             
@@ -107,6 +240,25 @@ class FAISSService:
             logger.error(f"FAISS search failed: {e}")
             return []
     
+    def _to_results(self, distances: np.ndarray, metadata_list: List[Dict[str, Any]]) -> List[SearchResult]:
+        """Convert FAISS hits into search results, skipping empty slots."""
+        results = []
+        for i, (distance, metadata) in enumerate(zip(distances, metadata_list)):
+            if metadata:
+                # Create SearchResult with metadata from FAISS
+                results.append(SearchResult(
+                    paper_id=metadata.get('doc_id'),
+                    title=metadata.get('title', ''),
+                    authors=metadata.get('authors', ''),
+                    abstract=metadata.get('text', '')[:500] + "..." if len(metadata.get('text', '')) > 500 else metadata.get('text', ''),
+                    score=float(distance),
+                    search_type="faiss",
+                    chunk_id=metadata.get('chunk_id'),
+                    text=metadata.get('text', '')[:200] + "..." if len(metadata.get('text', '')) > 200 else metadata.get('text', '')
+                ))
+        
+        return results
+    
     async def health_check(self) -> Dict[str, Any]:
         """Check FAISS health."""
         try:
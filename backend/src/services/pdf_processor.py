@@ -258,15 +258,32 @@ class PDFProcessor:
                 "CREATE INDEX IF NOT EXISTS idx_papers_text_length ON papers (text_length)",
                 "CREATE INDEX IF NOT EXISTS idx_papers_word_count ON papers (word_count)",
                 "CREATE INDEX IF NOT EXISTS idx_papers_processed_timestamp ON papers (processed_timestamp)",
-                "CREATE INDEX IF NOT EXISTS idx_papers_title_gin ON papers USING GIN (to_tsvector('english', title))",
-                "CREATE INDEX IF NOT EXISTS idx_papers_abstract_gin ON papers USING GIN (to_tsvector('english', abstract))",
-                "CREATE INDEX IF NOT EXISTS idx_papers_full_text_gin ON papers USING GIN (to_tsvector('english', full_text))",
                 "CREATE INDEX IF NOT EXISTS idx_papers_body_gin ON papers USING GIN (to_tsvector('english', body))"
             ]
             
             for index_sql in indexes:
                 self.cursor.execute(index_sql)
             
+            # Full-text search reads one stored tsvector instead of per-column expression indexes
+            search_sql = [
+                """
+                ALTER TABLE papers ADD COLUMN IF NOT EXISTS search_tsv tsvector
+                GENERATED ALWAYS AS (
+                    to_tsvector('english',
+                                COALESCE(title, '') || ' ' ||
+                                COALESCE(abstract, '') || ' ' ||
+                                COALESCE(full_text, ''))
+                ) STORED
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_papers_search_tsv ON papers USING GIN (search_tsv)",
+                "DROP INDEX IF EXISTS idx_papers_title_gin",
+                "DROP INDEX IF EXISTS idx_papers_abstract_gin",
+                "DROP INDEX IF EXISTS idx_papers_full_text_gin"
+            ]
+            
+            for search_ddl in search_sql:
+                self.cursor.execute(search_ddl)
+            
             self.connection.commit()
             logger.info("Database tables and indexes created successfully")
             
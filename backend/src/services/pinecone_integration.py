@@ -17,23 +17,29 @@ Key Features:
 
 import json
 import logging
-import numpy as np
+import importlib.util
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 from datetime import datetime
 import tqdm
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import time
 import uuid
 
+from ..core.arxiv import arxiv_year
 from ..core.config import Config
 
-try:
-    from pinecone import Pinecone
-    PINECONE_AVAILABLE = True
-except ImportError:
-    PINECONE_AVAILABLE = False
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy and the Pinecone client (grpc/protobuf) are imported where they are
+# used, so importing this module stays cheap for processes that never touch them
+PINECONE_AVAILABLE = importlib.util.find_spec("pinecone") is not None
+if not PINECONE_AVAILABLE:
     print("Warning: Pinecone not installed. Install with: pip install pinecone")
 
 # Configure logging
@@ -55,13 +61,25 @@ class PineconeConfig:
     environment: str = None
     index_name: str = None
     dimension: int = 384
-    metric: str = "cosine"  # cosine, euclidean, dotproduct
+    metric: str = None  # cosine, euclidean, dotproduct (vectors are L2-normalized on upsert)
     pods: int = 1
     replicas: int = 1
     pod_type: str = "p1.x1"  # p1.x1, p1.x2, p1.x4, p1.x8
     # Serverless configuration
     cloud: str = "aws"  # aws, gcp, azure
     region: str = "us-east-1"
+    # Use the gRPC client when installed (pinecone[grpc]); falls back to REST
+    use_grpc: bool = True
+    # Partition upserts into namespaces: None (default namespace), "year"
+    # (derived from the arXiv doc_id) or the name of a chunk field
+    namespace_by: Optional[str] = None
+    # Decimal places kept in REST upsert payloads (None sends full float precision)
+    upsert_decimals: Optional[int] = 4
+    # Upsert pipelining: worker threads and max batches queued behind them
+    upsert_workers: int = 8
+    max_pending_batches: int = 4
+    # Seconds to reuse describe_index_stats() results (health probes poll this)
+    stats_cache_ttl: float = 5.0
     
     def __post_init__(self):
         """Initialize with default values from Config if not provided."""
@@ -73,6 +91,8 @@ class PineconeConfig:
             self.index_name = Config.PINECONE_INDEX_NAME
         if self.dimension is None:
             self.dimension = Config.PINECONE_DIMENSION
+        if self.metric is None:
+            self.metric = Config.PINECONE_METRIC
 
 
 class PineconeManager:
@@ -91,14 +111,27 @@ class PineconeManager:
         self.config = config or PineconeConfig()
         self.pc = None
         self.index = None
+        self.uses_grpc = False
+        self._stats_cache = None  # (monotonic timestamp, stats)
+        self._stats_lock = threading.Lock()
         
     def connect(self):
         """Connect to Pinecone and initialize index."""
         try:
             logger.info(f"Connecting to Pinecone...")
             
-            # Initialize Pinecone client
-            self.pc = Pinecone(api_key=self.config.api_key)
+            # Initialize Pinecone client, preferring gRPC when its extras are installed
+            self.uses_grpc = False
+            if self.config.use_grpc:
+                try:
+                    from pinecone.grpc import PineconeGRPC as client_class
+                    self.uses_grpc = True
+                except ImportError:
+                    logger.warning("Pinecone gRPC extras not installed, falling back to REST")
+            if not self.uses_grpc:
+                from pinecone import Pinecone as client_class
+            self.pc = client_class(api_key=self.config.api_key)
+            logger.info(f"Using Pinecone {'gRPC' if self.uses_grpc else 'REST'} client")
             
             # Check if index exists
             existing_indexes = self.pc.list_indexes()
@@ -113,7 +146,7 @@ class PineconeManager:
                 self.index = self.pc.Index(self.config.index_name)
             
             # Get index stats
-            stats = self.index.describe_index_stats()
+            stats = self.describe_index_stats(force_refresh=True)
             logger.info(f"Index stats: {stats}")
             logger.info("[OK] Successfully connected to Pinecone!")
             
@@ -123,6 +156,8 @@ class PineconeManager:
     
     def _create_index(self):
         """Create a new Pinecone index."""
+        from pinecone import ServerlessSpec
+        
         try:
             # Create index with serverless configuration
             self.pc.create_index(
@@ -139,18 +174,20 @@ class PineconeManager:
             logger.error(f"Failed to create index: {e}")
             raise
     
-    def upsert_vectors(self, vectors: List[Dict[str, Any]], batch_size: int = 100):
+    def upsert_vectors(self, vectors: List[Dict[str, Any]], batch_size: int = 100,
+                       namespace: Optional[str] = None):
         """
         Upsert vectors to Pinecone index.
         
         Args:
             vectors: List of vectors with id, values, and metadata
             batch_size: Number of vectors per batch
+            namespace: Target namespace (None for the default namespace)
         """
         if not self.index:
             raise ValueError("Not connected to Pinecone. Call connect() first.")
         
-        logger.info(f"Upserting {len(vectors)} vectors to Pinecone")
+        logger.info(f"Upserting {len(vectors)} vectors to Pinecone namespace '{namespace or ''}'")
         
         # Process vectors in batches
         for i in range(0, len(vectors), batch_size):
@@ -158,15 +195,36 @@ class PineconeManager:
             
             try:
                 # Upsert batch
-                self.index.upsert(vectors=batch)
+                self.index.upsert(vectors=batch, namespace=namespace)
                 logger.info(f"Upserted batch {i//batch_size + 1} ({len(batch)} vectors)")
                 
             except Exception as e:
                 logger.error(f"Error upserting batch {i//batch_size + 1}: {e}")
                 continue
     
-    def search(self, query_vector: np.ndarray, top_k: int = 10, 
-              filter_dict: Dict[str, Any] = None, include_metadata: bool = True) -> List[Dict[str, Any]]:
+    def prepare_query_vector(self, query_vector: 'np.ndarray'):
+        """
+        Convert a query vector into the form the active client sends most cheaply.
+        
+        The gRPC client packs a float32 array straight into the protobuf request,
+        so the per-element Python float list is only built for the REST client.
+        
+        Args:
+            query_vector: Query vector
+            
+        Returns:
+            float32 array for gRPC, list of floats for REST
+        """
+        import numpy as np
+        
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        if self.uses_grpc:
+            return query_vector
+        return query_vector.tolist()
+    
+    def search(self, query_vector: 'np.ndarray', top_k: int = 10, 
+              filter_dict: Dict[str, Any] = None, include_metadata: bool = True,
+              namespace: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Search for similar vectors.
         
@@ -175,6 +233,7 @@ class PineconeManager:
             top_k: Number of results to return
             filter_dict: Optional metadata filters
             include_metadata: Whether to include metadata in results
+            namespace: Namespace to search (None for the default namespace)
             
         Returns:
             List of search results
@@ -183,15 +242,13 @@ class PineconeManager:
             raise ValueError("Not connected to Pinecone. Call connect() first.")
         
         try:
-            # Convert query vector to list
-            query_vector_list = query_vector.tolist()
-            
             # Search
             results = self.index.query(
-                vector=query_vector_list,
+                vector=self.prepare_query_vector(query_vector),
                 top_k=top_k,
                 filter=filter_dict,
-                include_metadata=include_metadata
+                include_metadata=include_metadata,
+                namespace=namespace
             )
             
             # Format results
@@ -210,6 +267,33 @@ class PineconeManager:
             logger.error(f"Error searching Pinecone: {e}")
             return []
     
+    def search_namespaces(self, query_vector: 'np.ndarray', namespaces: List[str], top_k: int = 10,
+                          filter_dict: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Search several namespaces in parallel and merge the best matches.
+        
+        Args:
+            query_vector: Query vector
+            namespaces: Namespaces to search
+            top_k: Number of results to return
+            filter_dict: Optional metadata filters
+            
+        Returns:
+            Top results across all namespaces, best score first
+        """
+        if not namespaces:
+            return self.search(query_vector, top_k, filter_dict)
+        
+        with ThreadPoolExecutor(max_workers=len(namespaces)) as executor:
+            futures = [
+                executor.submit(self.search, query_vector, top_k, filter_dict, True, namespace)
+                for namespace in namespaces
+            ]
+            merged = [result for future in futures for result in future.result()]
+        
+        merged.sort(key=lambda result: result['score'], reverse=True)
+        return merged[:top_k]
+    
     def delete_vectors(self, vector_ids: List[str]):
         """
         Delete vectors by IDs.
@@ -226,13 +310,36 @@ class PineconeManager:
         except Exception as e:
             logger.error(f"Error deleting vectors: {e}")
     
+    def describe_index_stats(self, force_refresh: bool = False):
+        """
+        Get raw index statistics, reusing a recent result within the cache TTL.
+        
+        Args:
+            force_refresh: Bypass the cache and query Pinecone
+            
+        Returns:
+            Pinecone index stats response
+        """
+        if not self.index:
+            raise ValueError("Not connected to Pinecone. Call connect() first.")
+        
+        with self._stats_lock:
+            now = time.monotonic()
+            if (not force_refresh and self._stats_cache is not None
+                    and now - self._stats_cache[0] < self.config.stats_cache_ttl):
+                return self._stats_cache[1]
+            
+            stats = self.index.describe_index_stats()
+            self._stats_cache = (time.monotonic(), stats)
+            return stats
+    
     def get_index_stats(self) -> Dict[str, Any]:
         """Get index statistics."""
         if not self.index:
             return {"status": "Not connected"}
         
         try:
-            stats = self.index.describe_index_stats()
+            stats = self.describe_index_stats()
             return {
                 "total_vector_count": stats.total_vector_count,
                 "dimension": stats.dimension,
@@ -266,6 +373,8 @@ class PineconePipeline:
             chunks_file: Path to input JSONL file with chunks
             batch_size: Number of vectors to process in each batch
         """
+        import numpy as np
+        
         logger.info(f"Starting Pinecone processing for {chunks_file}")
         
         chunks_path = Path(chunks_file)
@@ -275,10 +384,14 @@ class PineconePipeline:
         # Connect to Pinecone
         self.manager.connect()
         
-        # Process chunks and prepare vectors
-        vectors = []
+        # Process chunks and prepare vectors; batches are upserted by worker
+        # threads while this thread keeps parsing
+        batches = {}  # namespace -> vectors waiting to be upserted
+        pending = set()
+        max_pending = self.config.upsert_workers + self.config.max_pending_batches
+        executor = ThreadPoolExecutor(max_workers=self.config.upsert_workers)
         
-        with open(chunks_file, 'r', encoding='utf-8') as f:
+        with executor, open(chunks_file, 'r', encoding='utf-8') as f:
             for line_num, line in enumerate(tqdm.tqdm(f, desc="Processing chunks")):
                 if not line.strip():
                     continue
@@ -291,10 +404,19 @@ class PineconePipeline:
                         logger.warning(f"Chunk {line_num + 1} has no embedding, skipping")
                         continue
                     
+                    # L2-normalize so dot product equals cosine similarity
+                    values = np.asarray(chunk['embedding'], dtype=np.float32)
+                    values /= np.linalg.norm(values) + 1e-12
+                    
+                    # REST sends values as JSON text; rounding in float64 keeps each
+                    # number short instead of a 17-digit float32 repr
+                    if not self.manager.uses_grpc and self.config.upsert_decimals is not None:
+                        values = np.round(values.astype(np.float64), self.config.upsert_decimals)
+                    
                     # Create vector for Pinecone
                     vector = {
                         "id": chunk.get('chunk_id', f"chunk_{line_num}"),
-                        "values": chunk['embedding'],
+                        "values": values.tolist(),
                         "metadata": {
                             "doc_id": chunk.get('doc_id'),
                             "chunk_index": chunk.get('chunk_index'),
@@ -309,13 +431,15 @@ class PineconePipeline:
                         }
                     }
                     
+                    namespace = self._chunk_namespace(chunk)
+                    vectors = batches.setdefault(namespace, [])
                     vectors.append(vector)
                     self.processed_documents += 1
                     
-                    # Process batch when it reaches batch_size
+                    # Hand off batch when it reaches batch_size
                     if len(vectors) >= batch_size:
-                        self.manager.upsert_vectors(vectors, batch_size)
-                        vectors = []
+                        self._submit_batch(executor, pending, max_pending, vectors, batch_size, namespace)
+                        batches[namespace] = []
                         
                 except json.JSONDecodeError as e:
                     logger.warning(f"Error parsing line {line_num + 1}: {e}")
@@ -323,17 +447,62 @@ class PineconePipeline:
                 except Exception as e:
                     logger.warning(f"Error processing chunk at line {line_num + 1}: {e}")
                     continue
-        
-        # Process remaining vectors
-        if vectors:
-            self.manager.upsert_vectors(vectors, batch_size)
+            
+            # Process remaining vectors
+            for namespace, vectors in batches.items():
+                if vectors:
+                    self._submit_batch(executor, pending, max_pending, vectors, batch_size, namespace)
+            
+            # Wait for in-flight upserts
+            wait(pending)
         
         logger.info(f"Pinecone processing completed!")
         logger.info(f"Processed documents: {self.processed_documents}")
         logger.info(f"Index stats: {self.manager.get_index_stats()}")
     
-    def search(self, query_vector: np.ndarray, top_k: int = 10, 
-              filters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    def _chunk_namespace(self, chunk: Dict[str, Any]) -> Optional[str]:
+        """
+        Pick the Pinecone namespace for a chunk according to config.namespace_by.
+        
+        Args:
+            chunk: Chunk dictionary
+            
+        Returns:
+            Namespace name, or None for the default namespace
+        """
+        namespace_by = self.config.namespace_by
+        if not namespace_by:
+            return None
+        
+        if namespace_by == "year":
+            # Same year parsing as the FAISS date filter, so both partition alike
+            year = arxiv_year(str(chunk.get('doc_id') or ''))
+            return str(year) if year is not None else None
+        
+        value = chunk.get(namespace_by)
+        return str(value) if value else None
+    
+    def _submit_batch(self, executor: ThreadPoolExecutor, pending: set, max_pending: int,
+                      vectors: List[Dict[str, Any]], batch_size: int, namespace: Optional[str] = None):
+        """
+        Queue a batch for upsert, blocking while too many batches are in flight.
+        
+        Args:
+            executor: Upsert thread pool
+            pending: Set of in-flight upsert futures (updated in place)
+            max_pending: Maximum number of in-flight batches
+            vectors: Vectors to upsert
+            batch_size: Number of vectors per upsert request
+            namespace: Target namespace (None for the default namespace)
+        """
+        while len(pending) >= max_pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            pending.difference_update(done)
+        
+        pending.add(executor.submit(self.manager.upsert_vectors, vectors, batch_size, namespace))
+    
+    def search(self, query_vector: 'np.ndarray', top_k: int = 10, 
+              filters: Dict[str, Any] = None, namespaces: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Search for similar documents.
         
@@ -341,10 +510,13 @@ class PineconePipeline:
             query_vector: Query vector
             top_k: Number of results to return
             filters: Optional metadata filters
+            namespaces: Namespaces to search (None for the default namespace)
             
         Returns:
             List of similar documents
         """
+        if namespaces:
+            return self.manager.search_namespaces(query_vector, namespaces, top_k, filters)
         return self.manager.search(query_vector, top_k, filters)
 
 
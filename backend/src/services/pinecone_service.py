@@ -2,23 +2,36 @@
 Pinecone service for vector operations.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 
 from ..models.search import SearchResult
 from ..core.config import Config
 from .embedding_service import EmbeddingService
+from .postgres_service import PostgresService
 
 logger = logging.getLogger(__name__)
 
 class PineconeService:
     """Service for Pinecone vector operations."""
     
+    _instance = None
+    
+    def __new__(cls):
+        """Singleton pattern to reuse one Pinecone connection."""
+        if cls._instance is None:
+            cls._instance = super(PineconeService, cls).__new__(cls)
+        return cls._instance
+    
     def __init__(self):
-        self.pipeline = None
-        self.embedding_service = EmbeddingService()
-        self._connect()
+        if not hasattr(self, 'initialized'):
+            self.pipeline = None
+            self.embedding_service = EmbeddingService()
+            self.postgres_service = PostgresService()
+            self._connect()
+            self.initialized = True
     
     def _connect(self):
         """Connect to Pinecone."""
@@ -28,7 +41,8 @@ class PineconeService:
             config = PineconeConfig(
                 api_key=Config.PINECONE_API_KEY,
                 index_name=Config.PINECONE_INDEX_NAME,
-                environment=Config.PINECONE_ENVIRONMENT
+                environment=Config.PINECONE_ENVIRONMENT,
+                namespace_by=Config.PINECONE_NAMESPACE_BY
             )
             self.pipeline = PineconePipeline(config)
             self.pipeline.manager.connect()
@@ -37,47 +51,65 @@ class PineconeService:
             logger.error(f"Failed to connect to Pinecone: {e}")
             raise
     
-    async def search(self, query: str, n_results: int) -> List[SearchResult]:
-        """Search using Pinecone vector search."""
+    async def search(self, query: str, n_results: int,
+                     namespaces: Optional[List[str]] = None,
+                     date_range: Optional[Tuple[int, int]] = None) -> List[SearchResult]:
+        """
+        Search using Pinecone vector search, optionally across several namespaces.
+        
+        With year namespaces, an inclusive (first_year, last_year) date_range picks
+        the namespaces to query when none are given.
+        """
         try:
-            # Generate query embedding
-            query_embedding = self.embedding_service.generate_embedding(query)
+            # Generate query embedding, L2-normalized to match the dotproduct index
+            query_embedding = np.asarray(self.embedding_service.generate_embedding(query), dtype=np.float32)
+            query_embedding = query_embedding / (np.linalg.norm(query_embedding) + 1e-12)
             
-            # Search Pinecone
-            search_results = self.pipeline.manager.index.query(
-                vector=query_embedding.tolist(),
-                top_k=n_results,
-                include_metadata=True
+            # Year-partitioned indexes only need the namespaces inside the date range
+            if namespaces is None and date_range is not None and self.pipeline.config.namespace_by == "year":
+                first_year, last_year = date_range
+                namespaces = [str(year) for year in range(first_year, last_year + 1)]
+            
+            # Search Pinecone off the event loop; the manager queries namespaces
+            # concurrently and merges their top-k lists by score
+            matches = await asyncio.to_thread(
+                self.pipeline.manager.search_namespaces, query_embedding, namespaces or [], n_results
             )
             
-            results = []
-            for match in search_results.matches:
-                # Get full paper details from database
-                from .postgres_service import PostgresService
-                from psycopg2.extras import RealDictCursor
-                postgres_service = PostgresService()
-                
-                with postgres_service.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                    cursor.execute("""
-                        SELECT id, title, authors, abstract 
-                        FROM papers 
-                        WHERE id = %s
-                    """, (match.metadata.get('doc_id'),))
-                    paper = cursor.fetchone()
-                    
-                    if paper:
-                        results.append(SearchResult(
-                            paper_id=paper['id'],
-                            title=paper['title'],
-                            authors=paper['authors'],
-                            abstract=paper['abstract'][:500] + "..." if len(paper['abstract']) > 500 else paper['abstract'],
-                            score=float(match.score),
-                            search_type="pinecone",
-                            chunk_id=match.metadata.get('chunk_id'),
-                            text=match.metadata.get('text', '')[:200] + "..." if match.metadata.get('text') else None
-                        ))
+            # Get full paper details for all matches in one round-trip
+            doc_ids = [match['metadata'].get('doc_id') for match in matches]
+            pool = await self.postgres_service.get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT id, title, authors, abstract, LEFT(full_text, 301) AS full_text
+                    FROM papers 
+                    WHERE id = ANY($1::text[])
+                """, doc_ids)
+            papers_get = {row['id']: row for row in rows}.get
+            
+            # Hot loop: bind the constructor to a local once
+            _SearchResult = SearchResult
+            matched = [(match, match['metadata'], papers_get(match['metadata'].get('doc_id')))
+                       for match in matches]
             
-            return results
+            # Chunk text only lives in Pinecone metadata; papers has no per-chunk rows
+            return [
+                _SearchResult(
+                    paper_id=paper['id'],
+                    title=paper['title'],
+                    authors=paper['authors'],
+                    abstract=(paper['abstract'] or '')[:500] + "..." if len(paper['abstract'] or '') > 500 else paper['abstract'],
+                    score=float(match['score']),
+                    search_type="pinecone",
+                    chunk_id=metadata.get('chunk_id'),
+                    text=metadata.get('text', '')[:200] + "..." if metadata.get('text') else None,
+                    full_text_preview=(paper['full_text'][:300] + "..."
+                                       if paper['full_text'] and len(paper['full_text']) > 300
+                                       else paper['full_text'])
+                )
+                for match, metadata, paper in matched
+                if paper is not None
+            ]
             
         except Exception as e:
             logger.error(f"Pinecone search failed: {e}")
@@ -86,7 +118,7 @@ class PineconeService:
     async def health_check(self) -> Dict[str, Any]:
         """Check Pinecone health."""
         try:
-            stats = self.pipeline.manager.index.describe_index_stats()
+            stats = self.pipeline.manager.describe_index_stats()
             return {
                 "connected": True,
                 "total_vectors": stats.total_vector_count
@@ -2,78 +2,130 @@
 PostgreSQL service for database operations.
 """
 
+import asyncio
 import logging
 from typing import List, Dict, Any
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import asyncpg
 
 from ..models.search import SearchResult, DatabaseStats
 from ..core.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Parse the query into a tsquery once and reuse it for matching and ranking.
+# Kept as a single constant so asyncpg's per-connection statement cache always
+# hits the same prepared statement.
+_SEARCH_SQL = """
+    WITH q AS (SELECT plainto_tsquery('english', $1) AS tsq)
+    SELECT id, title, authors, abstract, categories, full_text, text_length, word_count, pdf_path,
+           ts_rank(search_tsv, q.tsq) as rank
+    FROM papers, q
+    WHERE search_tsv @@ q.tsq
+    ORDER BY rank DESC
+    LIMIT $2
+"""
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with an ellipsis."""
+    if not text:
+        return text
+    return text[:limit] + "..." if len(text) > limit else text
+
 class PostgresService:
-    """Service for PostgreSQL operations."""
+    """Service for PostgreSQL operations with a shared connection pool."""
+    
+    _instance = None
+    
+    def __new__(cls):
+        """Singleton pattern so every caller shares one connection pool."""
+        if cls._instance is None:
+            cls._instance = super(PostgresService, cls).__new__(cls)
+        return cls._instance
     
     def __init__(self):
-        self.connection = None
-        self._connect()
+        if not hasattr(self, 'initialized'):
+            self.pool = None
+            self._pool_task = None
+            self.initialized = True
     
-    def _connect(self):
-        """Connect to PostgreSQL database."""
+    async def get_pool(self) -> asyncpg.Pool:
+        """Return the connection pool, creating it on first use."""
+        if self.pool is None:
+            # Share one in-flight creation between concurrent first callers
+            if self._pool_task is None:
+                self._pool_task = asyncio.ensure_future(self._connect())
+            try:
+                await self._pool_task
+            except Exception:
+                self._pool_task = None
+                raise
+        return self.pool
+    
+    async def _connect(self):
+        """Create the PostgreSQL connection pool."""
         try:
-            self.connection = psycopg2.connect(
+            self.pool = await asyncpg.create_pool(
                 host=Config.DB_HOST,
                 port=Config.DB_PORT,
                 database=Config.DB_NAME,
                 user=Config.DB_USER,
-                password=Config.DB_PASSWORD
+                password=Config.DB_PASSWORD,
+                min_size=Config.DB_POOL_MIN_SIZE,
+                max_size=Config.DB_POOL_MAX_SIZE,
+                statement_cache_size=Config.DB_STATEMENT_CACHE_SIZE,
+                init=self._init_connection
             )
-            logger.info("[OK] PostgreSQL connected successfully!")
+            logger.info("[OK] PostgreSQL connection pool created successfully!")
         except Exception as e:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
             raise
     
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection):
+        """Prepare the hot search statement when a pool connection is opened."""
+        # asyncpg prepares and caches statements on first use; running the search
+        # once with LIMIT 0 moves that parse/plan off the first real request.
+        # The papers table may not exist yet on a fresh database.
+        try:
+            await conn.fetch(_SEARCH_SQL, "", 0)
+        except (asyncpg.UndefinedTableError, asyncpg.UndefinedColumnError):
+            pass
+    
+    async def close(self):
+        """Close the connection pool."""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            self._pool_task = None
+            logger.info("PostgreSQL connection pool closed")
+    
     async def search(self, query: str, n_results: int) -> List[SearchResult]:
         """Search using PostgreSQL full-text search."""
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                search_query = """
-                    SELECT id, title, authors, abstract, categories, full_text, text_length, word_count, pdf_path,
-                           ts_rank(to_tsvector('english', title || ' ' || abstract || ' ' || COALESCE(full_text, '')),
-                                   plainto_tsquery('english', %s)) as rank
-                    FROM papers
-                    WHERE to_tsvector('english', title || ' ' || abstract || ' ' || COALESCE(full_text, ''))
-                          @@ plainto_tsquery('english', %s)
-                    ORDER BY rank DESC
-                    LIMIT %s
-                """
-                cursor.execute(search_query, (query, query, n_results))
-                rows = cursor.fetchall()
-                
-                results = []
-                for row in rows:
-                    # Create full text preview (first 300 chars)
-                    full_text_preview = None
-                    if row['full_text']:
-                        full_text_preview = row['full_text'][:300] + "..." if len(row['full_text']) > 300 else row['full_text']
-                    
-                    results.append(SearchResult(
-                        paper_id=row['id'],
-                        title=row['title'],
-                        authors=row['authors'],
-                        abstract=row['abstract'][:500] + "..." if len(row['abstract']) > 500 else row['abstract'],
-                        score=float(row['rank']),
-                        search_type="postgres",
-                        categories=row.get('categories'),
-                        text_length=row.get('text_length'),
-                        word_count=row.get('word_count'),
-                        pdf_path=row.get('pdf_path'),
-                        full_text_preview=full_text_preview
-                    ))
-                
-                return results
-                
+            pool = await self.get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(_SEARCH_SQL, query, n_results)
+            
+            # Hot loop: bind the constructor and helper to locals once
+            _SearchResult = SearchResult
+            _trunc = _truncate
+            return [
+                _SearchResult(
+                    paper_id=row['id'],
+                    title=row['title'],
+                    authors=row['authors'],
+                    abstract=_trunc(row['abstract'], 500),
+                    score=float(row['rank']),
+                    search_type="postgres",
+                    categories=row['categories'],
+                    text_length=row['text_length'],
+                    word_count=row['word_count'],
+                    pdf_path=row['pdf_path'],
+                    full_text_preview=_trunc(row['full_text'], 300) or None  # first 300 chars
+                )
+                for row in rows
+            ]
+        
         except Exception as e:
             logger.error(f"PostgreSQL search failed: {e}")
             return []
@@ -81,28 +133,29 @@ class PostgresService:
     async def get_stats(self) -> DatabaseStats:
         """Get database statistics."""
         try:
-            with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                # Get total papers
-                cursor.execute("SELECT COUNT(*) as total FROM papers")
-                total_papers = cursor.fetchone()['total']
-                
-                # Get papers with full text
-                cursor.execute("SELECT COUNT(*) as count FROM papers WHERE full_text IS NOT NULL AND LENGTH(full_text) > 0")
-                papers_with_full_text = cursor.fetchone()['count']
-                
-                # Get average text length
-                cursor.execute("SELECT AVG(LENGTH(full_text)) as avg_length FROM papers WHERE full_text IS NOT NULL")
-                avg_length = cursor.fetchone()['avg_length'] or 0
+            pool = await self.get_pool()
+            async with pool.acquire() as conn:
+                # Get paper counts and average text length in one scan
+                counts = await conn.fetchrow("""
+                    SELECT COUNT(*) AS total_papers,
+                           COUNT(*) FILTER (WHERE full_text IS NOT NULL AND LENGTH(full_text) > 0)
+                               AS papers_with_full_text,
+                           AVG(LENGTH(full_text)) AS avg_length
+                    FROM papers
+                """)
+                total_papers = counts['total_papers']
+                papers_with_full_text = counts['papers_with_full_text']
+                avg_length = counts['avg_length'] or 0
                 
                 # Get top categories
-                cursor.execute("""
-                    SELECT categories, COUNT(*) as count 
-                    FROM papers 
-                    GROUP BY categories 
-                    ORDER BY count DESC 
+                rows = await conn.fetch("""
+                    SELECT categories, COUNT(*) as count
+                    FROM papers
+                    GROUP BY categories
+                    ORDER BY count DESC
                     LIMIT 5
                 """)
-                top_categories = [{"category": row['categories'], "count": row['count']} for row in cursor.fetchall()]
+                top_categories = [{"category": row['categories'], "count": row['count']} for row in rows]
             
             return DatabaseStats(
                 total_papers=total_papers,
@@ -117,9 +170,9 @@ class PostgresService:
     async def health_check(self) -> Dict[str, Any]:
         """Check PostgreSQL health."""
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM papers")
-                paper_count = cursor.fetchone()[0]
+            pool = await self.get_pool()
+            async with pool.acquire() as conn:
+                paper_count = await conn.fetchval("SELECT COUNT(*) FROM papers")
             
             return {
                 "connected": True,
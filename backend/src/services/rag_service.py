@@ -2,12 +2,21 @@
 RAG (Retrieval-Augmented Generation) service for intelligent paper analysis.
 """
 
+import asyncio
+import hashlib
 import logging
+import random
+import re
+import time
 import uuid
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, AsyncIterator
+import aiohttp
+import json
+import numpy as np
 
 from ..models.search import SearchResult, ConversationMessage
+from ..core.arxiv import arxiv_year
 from ..core.config import Config
 from .search_service import SearchService
 from .conversation_service import ConversationService
@@ -15,62 +24,30 @@ from .guardrails_service import GuardrailsService
 
 logger = logging.getLogger(__name__)
 
-class RAGService:
-    """Service for RAG operations combining retrieval and generation."""
-    
-    def __init__(self):
-        self.search_service = SearchService()
-        self.conversation_service = ConversationService()
-        self.guardrails_service = GuardrailsService()
-        
-        # Initialize OpenAI client (Azure or regular)
-        if Config.USE_AZURE_OPENAI:
-            # Azure OpenAI configuration
-            if not Config.AZURE_OPENAI_API_KEY or not Config.AZURE_OPENAI_ENDPOINT:
-                raise ValueError("Azure OpenAI configuration missing. Please add AZURE_OPENAI_API_KEY and AZURE_OPENAI_ENDPOINT to your .env file.")
-            
-            self.client = OpenAI(
-                api_key=Config.AZURE_OPENAI_API_KEY,
-                base_url=f"{Config.AZURE_OPENAI_ENDPOINT}openai/deployments/{Config.AZURE_OPENAI_DEPLOYMENT}",
-                default_query={"api-version": Config.AZURE_OPENAI_API_VERSION}
-            )
-            self.model = Config.AZURE_OPENAI_DEPLOYMENT  # Use deployment name for Azure
-            logger.info(f"Initialized Azure OpenAI client with deployment: {Config.AZURE_OPENAI_DEPLOYMENT}")
-        else:
-            # Regular OpenAI configuration
-            if not Config.OPENAI_API_KEY:
-                raise ValueError("OPENAI_API_KEY not found in environment variables. Please add it to your .env file.")
-            
-            self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
-            self.model = Config.OPENAI_MODEL
-            logger.info(f"Initialized regular OpenAI client with model: {Config.OPENAI_MODEL}")
-        
-        self.max_tokens = Config.OPENAI_MAX_TOKENS
-        self.temperature = Config.OPENAI_TEMPERATURE
-        
-    def _format_papers_for_context(self, papers: List[SearchResult]) -> str:
-        """Format retrieved papers as context for the LLM."""
-        if not papers:
-            return "No relevant papers found."
-        
-        context = "Here are the most relevant research papers:\n\n"
-        
-        for i, paper in enumerate(papers, 1):
-            context += f"**Paper {i}:**\n"
-            context += f"Title: {paper.title}\n"
-            context += f"Authors: {paper.authors}\n"
-            context += f"Abstract: {paper.abstract}\n"
-            context += f"Relevance Score: {paper.score:.3f}\n"
-            context += f"Source: {paper.search_type}\n"
-            if paper.text:
-                context += f"Relevant Content: {paper.text}\n"
-            context += "\n---\n\n"
-        
-        return context
-    
-    def _create_rag_prompt(self, user_query: str, context: str, conversation_context: str = "") -> str:
-        """Create a comprehensive RAG prompt for the LLM."""
-        prompt = f"""You are an expert astronomy and astrophysics research assistant. Your task is to provide comprehensive, accurate answers based on the research papers provided and the conversation history.
+# Per-field character budgets for paper context sent to the LLM
+_MAX_ABSTRACT = 800
+_MAX_TEXT = 1500
+
+def _truncate_on_sentence(text: Optional[str], limit: int) -> Optional[str]:
+    """Cut text to at most limit characters, preferring the last sentence end before it."""
+    if not text or len(text) <= limit:
+        return text
+    cut = text.rfind('. ', 0, limit)
+    return text[:cut + 1] if cut > 0 else text[:limit] + "..."
+
+# Abstract phrases that flag open problems, matched in a single scan
+_GAP_PAT = re.compile(r'limitation|future work|further research', re.IGNORECASE)
+
+# Line prefixes for reasoning-step extraction; str.startswith accepts a tuple,
+# so each line is classified in one C-level call instead of a chain of them
+_BULLET_PREFIXES = ('-', '•', '*')
+_NUMBERED_PREFIXES = ('1.', '2.', '3.', '4.', '5.')
+_MAX_REASONING_STEPS = 5
+
+_SYSTEM_PROMPT = "You are an expert astronomy and astrophysics research assistant. You MUST respond in the exact format specified in the user's request. Keep responses concise and structured."
+
+# Static RAG prompt; only the three placeholders change per request
+_RAG_PROMPT = """You are an expert astronomy and astrophysics research assistant. Your task is to provide comprehensive, accurate answers based on the research papers provided and the conversation history.
 
 {conversation_context}
 
@@ -123,25 +100,309 @@ You MUST structure your response exactly as follows:
 Keep each section concise (2-3 sentences max per section). Do NOT write long paragraphs or detailed explanations.
 
 RESPONSE:"""
+
+class _TokenRateLimiter:
+    """Token buckets for this worker process's share of the LLM API per-minute quotas."""
+    
+    def __init__(self, tokens_per_minute: int, requests_per_minute: int):
+        self.token_capacity = float(tokens_per_minute)
+        self.request_capacity = float(requests_per_minute)
+        self.tokens = self.token_capacity
+        self.requests = self.request_capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        """Add the capacity earned since the last update."""
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = min(self.token_capacity, self.tokens + elapsed * self.token_capacity / 60)
+        self.requests = min(self.request_capacity, self.requests + elapsed * self.request_capacity / 60)
+    
+    async def acquire(self, tokens: int) -> int:
+        """Wait until one request and `tokens` tokens fit the quota, then reserve them."""
+        tokens = min(tokens, self.token_capacity)
+        while True:
+            # Check and debit happen without an await in between, so coroutines
+            # on the event loop cannot interleave here
+            self._refill()
+            if self.tokens >= tokens and self.requests >= 1:
+                self.tokens -= tokens
+                self.requests -= 1
+                return tokens
+            await asyncio.sleep(max(
+                (tokens - self.tokens) * 60 / self.token_capacity,
+                (1 - self.requests) * 60 / self.request_capacity
+            ))
+    
+    def settle(self, reserved: int, used: Optional[int]):
+        """Correct a reservation once the actual token usage is known."""
+        if used is not None:
+            self.tokens = min(self.token_capacity, self.tokens + reserved - used)
+
+class RAGService:
+    """Service for RAG operations combining retrieval and generation."""
+    
+    def __init__(self):
+        self.search_service = SearchService()
+        self.conversation_service = ConversationService()
+        self.guardrails_service = GuardrailsService()
         
-        return prompt
+        # Configure the chat completions endpoint (Azure or regular OpenAI)
+        if Config.USE_AZURE_OPENAI:
+            # Azure OpenAI configuration
+            if not Config.AZURE_OPENAI_API_KEY or not Config.AZURE_OPENAI_ENDPOINT:
+                raise ValueError("Azure OpenAI configuration missing. Please add AZURE_OPENAI_API_KEY and AZURE_OPENAI_ENDPOINT to your .env file.")
+            
+            self.model = Config.AZURE_OPENAI_DEPLOYMENT  # Use deployment name for Azure
+            self._completions_url = (f"{Config.AZURE_OPENAI_ENDPOINT}openai/deployments/"
+                                     f"{Config.AZURE_OPENAI_DEPLOYMENT}/chat/completions")
+            self._http_headers = {"api-key": Config.AZURE_OPENAI_API_KEY}
+            self._http_params = {"api-version": Config.AZURE_OPENAI_API_VERSION}
+            logger.info(f"Initialized Azure OpenAI client with deployment: {Config.AZURE_OPENAI_DEPLOYMENT}")
+        else:
+            # Regular OpenAI configuration
+            if not Config.OPENAI_API_KEY:
+                raise ValueError("OPENAI_API_KEY not found in environment variables. Please add it to your .env file.")
+            
+            self.model = Config.OPENAI_MODEL
+            self._completions_url = f"{Config.OPENAI_BASE_URL}/chat/completions"
+            self._http_headers = {"Authorization": f"Bearer {Config.OPENAI_API_KEY}"}
+            self._http_params = {}
+            logger.info(f"Initialized regular OpenAI client with model: {Config.OPENAI_MODEL}")
+        
+        self.max_tokens = Config.OPENAI_MAX_TOKENS
+        self.temperature = Config.OPENAI_TEMPERATURE
+        
+        # Chat completions go through one shared aiohttp session, created on first use
+        # inside the event loop (the SDK's httpx pool contends under high concurrency)
+        self.http: Optional[aiohttp.ClientSession] = None
+        
+        # Keep LLM traffic under the API quotas instead of running into 429s
+        self._limiter = _TokenRateLimiter(Config.OPENAI_TOKENS_PER_MINUTE, Config.OPENAI_REQUESTS_PER_MINUTE)
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+        
+        # Health check result shared by probes within the TTL: (monotonic timestamp, result)
+        self._health_cache: Optional[tuple] = None
+        self._health_lock: Optional[asyncio.Lock] = None
+        
+        # Response cache: exact matches keyed by query + conversation context, and a
+        # semantic layer (ring buffer of query embeddings) for context-free queries
+        self._exact_cache: OrderedDict = OrderedDict()
+        self._sem_embs = np.zeros((Config.RAG_CACHE_MAX_SIZE, Config.EMBEDDING_VECTOR_DIMENSION), dtype=np.float32)
+        self._sem_results: List[Optional[Dict[str, Any]]] = [None] * Config.RAG_CACHE_MAX_SIZE
+        # Request settings each slot was answered with; a similar query only reuses matching ones
+        self._sem_n_results = np.zeros(Config.RAG_CACHE_MAX_SIZE, dtype=np.int64)
+        self._sem_search_types = np.empty(Config.RAG_CACHE_MAX_SIZE, dtype=object)
+        self._sem_count = 0
+        self._sem_next = 0
+        
+    def _get_http(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self.http is None or self.http.closed:
+            self.http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=Config.OPENAI_HTTP_MAX_CONNECTIONS,
+                    limit_per_host=Config.OPENAI_HTTP_MAX_CONNECTIONS_PER_HOST
+                ),
+                headers=self._http_headers,
+                # Bound the wait between reads so long streams are not cut off
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=Config.OPENAI_TIMEOUT)
+            )
+        return self.http
+    
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self.http is not None:
+            await self.http.close()
+            self.http = None
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the LLM concurrency semaphore, created inside the running event loop."""
+        if self._llm_semaphore is None:
+            self._llm_semaphore = asyncio.Semaphore(Config.OPENAI_MAX_CONCURRENCY)
+        return self._llm_semaphore
+    
+    def _estimate_tokens(self, messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """Rough token reservation for a request: ~4 characters per prompt token plus the completion budget."""
+        return sum(len(message["content"]) for message in messages) // 4 + max_tokens
+    
+    async def _post_with_retry(self, payload: Dict[str, Any],
+                               timeout: Optional[aiohttp.ClientTimeout] = None,
+                               max_retries: int = Config.OPENAI_MAX_RETRIES) -> aiohttp.ClientResponse:
+        """POST to the chat completions endpoint, retrying rate limits, server errors and timeouts."""
+        for attempt in range(max_retries):
+            last_attempt = attempt == max_retries - 1
+            retry_after = None
+            try:
+                resp = await self._get_http().post(self._completions_url, params=self._http_params,
+                                                   json=payload, timeout=timeout)
+                if resp.status < 400:
+                    return resp
+                resp.release()
+                if (resp.status != 429 and resp.status < 500) or last_attempt:
+                    resp.raise_for_status()
+                retry_after = resp.headers.get("Retry-After")
+                reason = f"HTTP {resp.status}"
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                if last_attempt:
+                    raise
+                reason = type(e).__name__
+            
+            # Exponential backoff with jitter, honouring Retry-After when the API sends one
+            delay = min(Config.OPENAI_RETRY_MAX_WAIT, 2 ** attempt) + random.uniform(0, 1)
+            if retry_after and retry_after.replace('.', '', 1).isdigit():
+                delay = max(delay, float(retry_after))
+            logger.warning(f"LLM request failed ({reason}), retrying in {delay:.1f}s "
+                           f"(attempt {attempt + 1}/{max_retries})")
+            await asyncio.sleep(delay)
+    
+    async def _chat_completion(self, messages: List[Dict[str, str]], max_tokens: Optional[int] = None,
+                               timeout: float = Config.OPENAI_TIMEOUT,
+                               max_retries: int = Config.OPENAI_MAX_RETRIES) -> Dict[str, Any]:
+        """POST a chat completion request and return the decoded JSON response."""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens or self.max_tokens,
+            "temperature": self.temperature,
+            "stream": False
+        }
+        async with self._get_semaphore():
+            reserved = await self._limiter.acquire(self._estimate_tokens(messages, payload["max_tokens"]))
+            used = None
+            try:
+                async with await self._post_with_retry(payload, aiohttp.ClientTimeout(total=timeout),
+                                                       max_retries) as resp:
+                    response = await resp.json()
+                used = (response.get("usage") or {}).get("total_tokens")
+                return response
+            finally:
+                self._limiter.settle(reserved, used)
+    
+    async def _chat_completion_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[Dict[str, Any]]:
+        """POST a streaming chat completion request and yield each decoded server-sent chunk."""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+        async with self._get_semaphore():
+            reserved = await self._limiter.acquire(self._estimate_tokens(messages, self.max_tokens))
+            used = None
+            try:
+                # Only the request itself is retried; a stream that has started is not replayed
+                async with await self._post_with_retry(payload) as resp:
+                    async for line in resp.content:
+                        line = line.strip()
+                        if not line.startswith(b"data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == b"[DONE]":
+                            break
+                        chunk = json.loads(data)
+                        if chunk.get("usage"):
+                            used = chunk["usage"].get("total_tokens")
+                        yield chunk
+            finally:
+                self._limiter.settle(reserved, used)
+    
+    @staticmethod
+    def _cache_key(query: str, conversation_context: str, n_results: int, search_type: str) -> str:
+        """Build the exact-match cache key for a request."""
+        return hashlib.sha1(f"{query}|{conversation_context}|{n_results}|{search_type}".encode()).hexdigest()
+    
+    async def _embed_for_cache(self, query: str) -> Optional[np.ndarray]:
+        """Embed a query for the semantic cache, or None if embedding fails."""
+        try:
+            return await self.search_service.faiss_service.embedding_service.embed_query(query)
+        except Exception as e:
+            logger.error(f"Failed to embed query for response cache: {e}")
+            return None
+    
+    def _cache_get(self, key: str, query_embedding: Optional[np.ndarray],
+                   n_results: int, search_type: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response by exact key, then by query similarity under the same settings."""
+        result = self._exact_cache.get(key)
+        if result is not None:
+            self._exact_cache.move_to_end(key)
+            return result
+        
+        if query_embedding is not None and self._sem_count:
+            # Embeddings are L2-normalized, so the dot product is the cosine similarity
+            sims = self._sem_embs[:self._sem_count] @ query_embedding
+            same_settings = ((self._sem_n_results[:self._sem_count] == n_results)
+                             & (self._sem_search_types[:self._sem_count] == search_type))
+            sims = np.where(same_settings, sims, -np.inf)
+            best = int(sims.argmax())
+            if sims[best] > Config.RAG_SEMANTIC_CACHE_THRESHOLD:
+                logger.info(f"Semantic cache hit (similarity {sims[best]:.3f})")
+                return self._sem_results[best]
+        return None
+    
+    def _cache_put(self, key: str, query_embedding: Optional[np.ndarray], n_results: int,
+                   search_type: str, result: Dict[str, Any]):
+        """Store a response in the exact cache and, if embedded, the semantic cache."""
+        self._exact_cache[key] = result
+        self._exact_cache.move_to_end(key)
+        if len(self._exact_cache) > Config.RAG_CACHE_MAX_SIZE:
+            self._exact_cache.popitem(last=False)
+        
+        if query_embedding is not None:
+            slot = self._sem_next
+            self._sem_embs[slot] = query_embedding
+            self._sem_results[slot] = result
+            self._sem_n_results[slot] = n_results
+            self._sem_search_types[slot] = search_type
+            self._sem_next = (slot + 1) % Config.RAG_CACHE_MAX_SIZE
+            self._sem_count = min(self._sem_count + 1, Config.RAG_CACHE_MAX_SIZE)
+    
+    def _format_papers_for_context(self, papers: List[SearchResult]) -> str:
+        """Format retrieved papers as context for the LLM."""
+        if not papers:
+            return "No relevant papers found."
+        
+        # Build one block per paper, keeping long fields to a sentence-aligned budget
+        blocks = []
+        for i, paper in enumerate(papers, 1):
+            parts = [f"**Paper {i}:**\n"
+                     f"Title: {paper.title}\n"
+                     f"Authors: {paper.authors}\n"
+                     f"Abstract: {_truncate_on_sentence(paper.abstract, _MAX_ABSTRACT)}\n"
+                     f"Relevance Score: {paper.score:.3f}\n"
+                     f"Source: {paper.search_type}\n"]
+            if paper.text:
+                parts.append(f"Relevant Content: {_truncate_on_sentence(paper.text, _MAX_TEXT)}\n")
+            parts.append("\n---\n\n")
+            blocks.append("".join(parts))
+        
+        # Drop the lowest-scoring papers while over budget; numbering stays aligned with sources
+        kept = list(range(len(papers)))
+        total = sum(len(block) for block in blocks)
+        for i in sorted(kept, key=lambda i: papers[i].score):
+            if total <= Config.RAG_CONTEXT_MAX_CHARS or len(kept) == 1:
+                break
+            kept.remove(i)
+            total -= len(blocks[i])
+        
+        context = "Here are the most relevant research papers:\n\n" + "".join(blocks[i] for i in kept)
+        logger.info(f"LLM context: {len(kept)}/{len(papers)} papers, {len(context)} chars")
+        return context
+    
+    def _create_rag_prompt(self, user_query: str, context: str, conversation_context: str = "") -> str:
+        """Create a comprehensive RAG prompt for the LLM."""
+        return _RAG_PROMPT.format(
+            conversation_context=conversation_context, context=context, user_query=user_query
+        )
     
     def _generate_follow_up_questions(self, papers: List[SearchResult], topic: str) -> List[str]:
         """Generate relevant follow-up questions based on the retrieved papers."""
         if not papers:
             return []
         
-        # Extract key topics and concepts from papers
-        topics = set()
-        for paper in papers:
-            if paper.categories:
-                topics.update(paper.categories.split())
-            if paper.abstract:
-                # Extract key terms (simplified)
-                words = paper.abstract.lower().split()
-                key_terms = [word for word in words if len(word) > 5 and word.isalpha()]
-                topics.update(key_terms[:10])  # Limit to avoid too many topics
-        
         # Generate follow-up questions based on common research patterns
         follow_ups = [
             f"What are the latest developments in {topic}?",
@@ -169,7 +430,7 @@ RESPONSE:"""
     
     def _extract_reasoning_steps(self, response_text: str) -> List[str]:
         """Extract reasoning steps from the AI response."""
-        reasoning_steps = []
+        reasoning_steps: List[str] = []
         
         # Look for methodology sections or reasoning indicators
         lines = response_text.split('\n')
@@ -177,298 +438,420 @@ RESPONSE:"""
         
         for line in lines:
             line = line.strip()
-            if 'methodology' in line.lower() or 'reasoning' in line.lower() or 'analysis' in line.lower():
+            lowered = line.lower()
+            if 'methodology' in lowered or 'reasoning' in lowered or 'analysis' in lowered:
                 in_methodology = True
                 continue
             elif line.startswith('##') and in_methodology:
                 break
             elif in_methodology and line:
-                if line.startswith('-') or line.startswith('•') or line.startswith('*'):
+                if line.startswith(_BULLET_PREFIXES):
                     reasoning_steps.append(line[1:].strip())
-                elif line and not line.startswith('#'):
+                elif not line.startswith('#'):
                     reasoning_steps.append(line)
+                if len(reasoning_steps) >= _MAX_REASONING_STEPS:
+                    break
         
         # If no explicit methodology section, extract from general structure
         if not reasoning_steps:
             for line in lines:
-                if (line.startswith('1.') or line.startswith('2.') or line.startswith('3.') or 
-                    line.startswith('4.') or line.startswith('5.')):
+                if line.startswith(_NUMBERED_PREFIXES):
                     reasoning_steps.append(line)
+                    if len(reasoning_steps) >= _MAX_REASONING_STEPS:
+                        break
         
-        return reasoning_steps[:5]  # Limit to 5 steps
+        return reasoning_steps[:_MAX_REASONING_STEPS]
     
     def _generate_research_summary(self, papers: List[SearchResult], query: str) -> Dict[str, Any]:
         """Generate a structured research summary."""
         if not papers:
             return {"total_papers": 0, "key_findings": [], "research_gaps": []}
         
-        # Extract key findings from abstracts
-        key_findings = []
-        research_gaps = []
-        total_papers = len(papers)
+        key_findings: List[str] = []
+        research_gaps: List[str] = []
+        years: List[int] = []
         
+        # One pass per paper: first sentence, gap keywords and arXiv year
         for paper in papers:
-            if paper.abstract:
+            abstract = paper.abstract
+            if abstract:
                 # Simple extraction of key findings (first sentence often contains main finding)
-                abstract_sentences = paper.abstract.split('.')
-                if abstract_sentences:
-                    key_findings.append(abstract_sentences[0].strip())
-        
-        # Identify research gaps (papers mentioning limitations or future work)
-        for paper in papers:
-            if paper.abstract and ('limitation' in paper.abstract.lower() or 
-                                 'future work' in paper.abstract.lower() or 
-                                 'further research' in paper.abstract.lower()):
-                research_gaps.append(f"Research gap identified in {paper.title[:50]}...")
+                first_period = abstract.find('.')
+                # Abstracts without a sentence break are capped rather than copied whole
+                key_findings.append(abstract[:first_period].strip() if first_period > 0 else abstract[:300].strip())
+                
+                # Identify research gaps (papers mentioning limitations or future work)
+                if _GAP_PAT.search(abstract):
+                    research_gaps.append(f"Research gap identified in {paper.title[:50]}...")
+            
+            # Extract years from arXiv paper IDs
+            year = arxiv_year(paper.paper_id or '')
+            if year is not None:
+                years.append(year)
         
         return {
-            "total_papers": total_papers,
+            "total_papers": len(papers),
             "key_findings": key_findings[:5],  # Top 5 findings
             "research_gaps": research_gaps[:3],  # Top 3 gaps
             "search_scope": query,
-            "date_range": self._extract_date_range(papers)
+            "date_range": ({"earliest": str(min(years)), "latest": str(max(years))}
+                           if years else {"earliest": "N/A", "latest": "N/A"})
         }
     
-    def _extract_date_range(self, papers: List[SearchResult]) -> Dict[str, str]:
-        """Extract date range from paper IDs (assuming arXiv format)."""
-        if not papers:
-            return {"earliest": "N/A", "latest": "N/A"}
+    async def _prepare_generation(self, query: str, conversation_id: Optional[str], n_results: int,
+                                  search_type: str, max_context_messages: int) -> Dict[str, Any]:
+        """
+        Run everything that happens before the LLM call.
         
-        # Extract years from paper IDs (assuming format like 0704.1224)
-        years = []
-        for paper in papers:
-            if paper.paper_id and len(paper.paper_id) >= 4:
-                try:
-                    year = int(paper.paper_id[:2])
-                    if year < 50:  # Assume 2000s
-                        year += 2000
-                    else:  # Assume 1900s
-                        year += 1900
-                    years.append(year)
-                except ValueError:
-                    continue
-        
-        if years:
-            return {
-                "earliest": str(min(years)),
-                "latest": str(max(years))
-            }
-        return {"earliest": "N/A", "latest": "N/A"}
-    
-    async def generate_response(self, query: str, conversation_id: Optional[str] = None, n_results: int = 5, search_type: str = "both", max_context_messages: int = 5) -> Dict[str, Any]:
-        """Generate a RAG response combining retrieval and generation."""
+        Returns a dict with a ready "result" when the request is answered without
+        the LLM (guardrails, no papers, cache hit), otherwise the state needed to
+        generate and finalize the response.
+        """
+        # Guardrails and the query embedding are independent; start them together.
+        # History stays on this thread: ConversationService shares one psycopg2 connection.
+        guard_task = asyncio.create_task(asyncio.to_thread(self.guardrails_service.is_astronomy_related, query))
+        embed_task = asyncio.create_task(self._embed_for_cache(query))
+        
+        # Step 0: Validate query is astronomy-related (Guardrails)
         try:
-            logger.info(f"RAG query: {query}, conversation_id: {conversation_id}")
-            
-            # Step 0: Validate query is astronomy-related (Guardrails)
-            is_astronomy, validation_reason = self.guardrails_service.is_astronomy_related(query)
-            logger.info(f"Query validation: {validation_reason}")
-            
-            if not is_astronomy:
-                # Return guardrails response for out-of-scope questions
-                fallback_response = self.guardrails_service.create_fallback_response(query, papers_available=False)
-                
-                # Still handle conversation context for the fallback
-                if conversation_id:
-                    user_message = ConversationMessage(
-                        conversation_id=conversation_id,
-                        message_type="user",
-                        content=query
-                    )
-                    self.conversation_service.add_message(user_message)
-                    
-                    assistant_message = ConversationMessage(
-                        conversation_id=conversation_id,
-                        message_type="assistant",
-                        content=fallback_response
-                    )
-                    self.conversation_service.add_message(assistant_message)
-                else:
-                    conversation_id = self.conversation_service.create_conversation(
-                        title="Out-of-scope question"
-                    )
-                
-                return {
-                    "response": fallback_response,
-                    "sources": [],
-                    "query": query,
-                    "search_results_count": 0,
-                    "conversation_id": conversation_id,
-                    "context_used": False,
-                    "guardrails_triggered": True,
-                    "validation_reason": validation_reason
-                }
+            is_astronomy, validation_reason = await guard_task
+        except BaseException:
+            embed_task.cancel()
+            raise
+        logger.info(f"Query validation: {validation_reason}")
+        
+        if not is_astronomy:
+            # Rejected queries don't need the embedding
+            embed_task.cancel()
             
-            # Step 1: Handle conversation context
-            conversation_context = ""
-            is_new_conversation = False
+            # Return guardrails response for out-of-scope questions
+            fallback_response = self.guardrails_service.create_fallback_response(query, papers_available=False)
             
+            # Still handle conversation context for the fallback
             if conversation_id:
-                # Get conversation history
-                history = self.conversation_service.get_conversation_history(
-                    conversation_id, limit=max_context_messages
-                )
-                if history:
-                    conversation_context = self.conversation_service.format_conversation_context(history)
-                    logger.info(f"Using conversation context with {len(history)} messages")
-                else:
-                    logger.warning(f"No history found for conversation {conversation_id}")
-            else:
-                # Create new conversation
-                conversation_id = self.conversation_service.create_conversation(
-                    title=query[:100] + "..." if len(query) > 100 else query
+                user_message = ConversationMessage(
+                    conversation_id=conversation_id,
+                    message_type="user",
+                    content=query
                 )
-                is_new_conversation = True
-                logger.info(f"Created new conversation: {conversation_id}")
-            
-            # Step 2: Add user message to conversation
-            user_message = ConversationMessage(
-                conversation_id=conversation_id,
-                message_type="user",
-                content=query
-            )
-            self.conversation_service.add_message(user_message)
-            
-            # Step 3: Retrieve relevant papers
-            papers = await self.search_service.search_papers(
-                query=query,
-                n_results=n_results,
-                search_type=search_type
-            )
-            
-            if not papers:
-                # Use guardrails fallback for no papers found
-                fallback_response = self.guardrails_service.create_fallback_response(query, papers_available=False)
+                self.conversation_service.add_message(user_message)
                 
-                # Add assistant message to conversation
                 assistant_message = ConversationMessage(
                     conversation_id=conversation_id,
                     message_type="assistant",
                     content=fallback_response
                 )
                 self.conversation_service.add_message(assistant_message)
-                
-                return {
-                    "response": fallback_response,
-                    "sources": [],
-                    "query": query,
-                    "search_results_count": 0,
-                    "conversation_id": conversation_id,
-                    "context_used": bool(conversation_context),
-                    "guardrails_triggered": True,
-                    "validation_reason": "No relevant papers found in database"
-                }
-            
-            # Step 4: Format context for LLM
-            context = self._format_papers_for_context(papers)
-            
-            # Step 5: Create RAG prompt
-            prompt = self._create_rag_prompt(query, context, conversation_context)
+            else:
+                conversation_id = self.conversation_service.create_conversation(
+                    title="Out-of-scope question"
+                )
             
-            # Step 6: Generate response using OpenAI
-            logger.info("Generating LLM response with conversation context...")
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert astronomy and astrophysics research assistant. You MUST respond in the exact format specified in the user's request. Keep responses concise and structured."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                timeout=Config.OPENAI_TIMEOUT
+            return {"result": {
+                "response": fallback_response,
+                "sources": [],
+                "query": query,
+                "search_results_count": 0,
+                "conversation_id": conversation_id,
+                "context_used": False,
+                "guardrails_triggered": True,
+                "validation_reason": validation_reason
+            }}
+        
+        # Step 1: Handle conversation context
+        conversation_context = ""
+        is_new_conversation = False
+        
+        if conversation_id:
+            # Get conversation history
+            history = self.conversation_service.get_conversation_history(
+                conversation_id, limit=max_context_messages
             )
-            
-            generated_text = response.choices[0].message.content
-            tokens_used = response.usage.total_tokens if response.usage else 0
-            
-            # Step 7: Skip grounding validation for now (temporarily disabled)
-            is_grounded = True
-            grounding_reason = "Validation temporarily disabled"
-            logger.info(f"Response grounding: {grounding_reason}")
-            
-            # Step 8: Add assistant message to conversation
-            sources_data = [
-                {
-                    "paper_id": paper.paper_id,
-                    "title": paper.title,
-                    "authors": paper.authors,
-                    "abstract": paper.abstract,
-                    "score": paper.score,
-                    "search_type": paper.search_type,
-                    "chunk_id": paper.chunk_id,
-                    "text": paper.text,
-                    "categories": paper.categories,
-                    "text_length": paper.text_length,
-                    "word_count": paper.word_count,
-                    "pdf_path": paper.pdf_path,
-                    "full_text_preview": paper.full_text_preview
-                }
-                for paper in papers
-            ]
-            
+            if history:
+                conversation_context = self.conversation_service.format_conversation_context(history)
+                logger.info(f"Using conversation context with {len(history)} messages")
+            else:
+                logger.warning(f"No history found for conversation {conversation_id}")
+        else:
+            # Create new conversation
+            conversation_id = self.conversation_service.create_conversation(
+                title=query[:100] + "..." if len(query) > 100 else query
+            )
+            is_new_conversation = True
+            logger.info(f"Created new conversation: {conversation_id}")
+        
+        # Step 2: Add user message to conversation
+        user_message = ConversationMessage(
+            conversation_id=conversation_id,
+            message_type="user",
+            content=query
+        )
+        self.conversation_service.add_message(user_message)
+        
+        # Serve repeated questions from cache. The key includes the conversation
+        # context, so new messages in a conversation naturally miss; the semantic
+        # layer is only used when there is no context to disagree with.
+        cache_key = self._cache_key(query, conversation_context, n_results, search_type)
+        query_embedding = await embed_task
+        semantic_embedding = None if conversation_context else query_embedding
+        cached_result = self._cache_get(cache_key, semantic_embedding, n_results, search_type)
+        if cached_result is not None:
             assistant_message = ConversationMessage(
                 conversation_id=conversation_id,
                 message_type="assistant",
-                content=generated_text,
-                sources=sources_data,
-                tokens_used=tokens_used
+                content=cached_result["response"],
+                sources=cached_result["sources"],
+                tokens_used=0
             )
             self.conversation_service.add_message(assistant_message)
             
-            # Step 9: Update conversation title if it's the first exchange
             if is_new_conversation:
                 title = query[:100] + "..." if len(query) > 100 else query
                 self.conversation_service.update_conversation_title(conversation_id, title)
             
-            # Step 10: Generate follow-up questions
-            follow_up_questions = self._generate_follow_up_questions(papers, query)
-            
-            # Step 11: Format response with enhanced metadata
-            result = {
-                "response": generated_text,
-                "sources": sources_data,
+            logger.info("RAG response served from cache")
+            return {"result": {
+                **cached_result,
                 "query": query,
-                "search_results_count": len(papers),
-                "model_used": self.model,
-                "tokens_used": tokens_used,
+                "tokens_used": 0,
                 "conversation_id": conversation_id,
                 "context_used": bool(conversation_context),
-                "guardrails_triggered": not is_grounded,
-                "validation_reason": grounding_reason if not is_grounded else "Response properly grounded",
-                "follow_up_questions": follow_up_questions,
-                "reasoning_steps": self._extract_reasoning_steps(generated_text),
-                "research_summary": self._generate_research_summary(papers, query)
-            }
+                "cached": True
+            }}
+        
+        # Step 3: Retrieve relevant papers
+        papers = await self.search_service.search_papers(
+            query=query,
+            n_results=n_results,
+            search_type=search_type,
+            query_embedding=query_embedding
+        )
+        
+        if not papers:
+            # Use guardrails fallback for no papers found
+            fallback_response = self.guardrails_service.create_fallback_response(query, papers_available=False)
             
-            logger.info(f"RAG response generated successfully. Tokens used: {tokens_used}, Context used: {bool(conversation_context)}")
-            return result
+            # Add assistant message to conversation
+            assistant_message = ConversationMessage(
+                conversation_id=conversation_id,
+                message_type="assistant",
+                content=fallback_response
+            )
+            self.conversation_service.add_message(assistant_message)
             
-        except Exception as e:
-            logger.error(f"RAG generation failed: {e}")
-            return {
-                "response": f"I encountered an error while processing your request: {str(e)}. Please try again or rephrase your question.",
+            return {"result": {
+                "response": fallback_response,
                 "sources": [],
                 "query": query,
                 "search_results_count": 0,
                 "conversation_id": conversation_id,
-                "error": str(e)
-            }
+                "context_used": bool(conversation_context),
+                "guardrails_triggered": True,
+                "validation_reason": "No relevant papers found in database"
+            }}
+        
+        # Step 4: Format context for LLM
+        context = self._format_papers_for_context(papers)
+        
+        # Step 5: Create RAG prompt
+        prompt = self._create_rag_prompt(query, context, conversation_context)
+        
+        return {
+            "query": query,
+            "conversation_id": conversation_id,
+            "conversation_context": conversation_context,
+            "is_new_conversation": is_new_conversation,
+            "papers": papers,
+            "cache_key": cache_key,
+            "query_embedding": semantic_embedding,
+            "n_results": n_results,
+            "search_type": search_type,
+            "messages": [
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+        }
+    
+    def _finalize_response(self, state: Dict[str, Any], generated_text: str, tokens_used: int,
+                           follow_up_questions: Optional[List[str]] = None,
+                           research_summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Record the assistant message and build the final response for a generated answer."""
+        query = state["query"]
+        conversation_id = state["conversation_id"]
+        conversation_context = state["conversation_context"]
+        papers = state["papers"]
+        
+        # Step 7: Skip grounding validation for now (temporarily disabled)
+        is_grounded = True
+        grounding_reason = "Validation temporarily disabled"
+        logger.info(f"Response grounding: {grounding_reason}")
+        
+        # Step 8: Add assistant message to conversation
+        # SearchResult's fields are exactly the source fields; the same list is
+        # stored with the message and returned
+        sources_data = [paper.model_dump() for paper in papers]
+        
+        assistant_message = ConversationMessage(
+            conversation_id=conversation_id,
+            message_type="assistant",
+            content=generated_text,
+            sources=sources_data,
+            tokens_used=tokens_used
+        )
+        self.conversation_service.add_message(assistant_message)
+        
+        # Step 9: Update conversation title if it's the first exchange
+        if state["is_new_conversation"]:
+            title = query[:100] + "..." if len(query) > 100 else query
+            self.conversation_service.update_conversation_title(conversation_id, title)
+        
+        # Step 10: Generate follow-up questions
+        if follow_up_questions is None:
+            follow_up_questions = self._generate_follow_up_questions(papers, query)
+        if research_summary is None:
+            research_summary = self._generate_research_summary(papers, query)
+        
+        # Step 11: Format response with enhanced metadata
+        result = {
+            "response": generated_text,
+            "sources": sources_data,
+            "query": query,
+            "search_results_count": len(papers),
+            "model_used": self.model,
+            "tokens_used": tokens_used,
+            "conversation_id": conversation_id,
+            "context_used": bool(conversation_context),
+            "guardrails_triggered": not is_grounded,
+            "validation_reason": grounding_reason if not is_grounded else "Response properly grounded",
+            "follow_up_questions": follow_up_questions,
+            "reasoning_steps": self._extract_reasoning_steps(generated_text),
+            "research_summary": research_summary,
+            "cached": False
+        }
+        self._cache_put(state["cache_key"], state["query_embedding"], state["n_results"],
+                        state["search_type"], result)
+        
+        logger.info(f"RAG response generated successfully. Tokens used: {tokens_used}, Context used: {bool(conversation_context)}")
+        return result
+    
+    @staticmethod
+    def _error_response(query: str, conversation_id: Optional[str], error: Exception) -> Dict[str, Any]:
+        """Build the response returned when generation fails."""
+        return {
+            "response": f"I encountered an error while processing your request: {str(error)}. Please try again or rephrase your question.",
+            "sources": [],
+            "query": query,
+            "search_results_count": 0,
+            "conversation_id": conversation_id,
+            "error": str(error)
+        }
+    
+    async def generate_response(self, query: str, conversation_id: Optional[str] = None, n_results: int = 5, search_type: str = "both", max_context_messages: int = 5) -> Dict[str, Any]:
+        """Generate a RAG response combining retrieval and generation."""
+        try:
+            logger.info(f"RAG query: {query}, conversation_id: {conversation_id}")
+            
+            state = await self._prepare_generation(query, conversation_id, n_results, search_type, max_context_messages)
+            if "result" in state:
+                return state["result"]
+            conversation_id = state["conversation_id"]
+            
+            # Step 6: Generate response using OpenAI
+            logger.info("Generating LLM response with conversation context...")
+            response = await self._chat_completion(state["messages"])
+            
+            generated_text = response["choices"][0]["message"]["content"]
+            tokens_used = (response.get("usage") or {}).get("total_tokens", 0)
+            
+            return self._finalize_response(state, generated_text, tokens_used)
+            
+        except Exception as e:
+            logger.error(f"RAG generation failed: {e}")
+            return self._error_response(query, conversation_id, e)
+    
+    async def generate_response_stream(self, query: str, conversation_id: Optional[str] = None, n_results: int = 5, search_type: str = "both", max_context_messages: int = 5) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a RAG response.
+        
+        Yields {"type": "delta", "delta": ...} events as tokens arrive, followed by a
+        single {"type": "final", ...} event carrying the same fields as generate_response.
+        """
+        try:
+            logger.info(f"RAG stream query: {query}, conversation_id: {conversation_id}")
+            
+            state = await self._prepare_generation(query, conversation_id, n_results, search_type, max_context_messages)
+            if "result" in state:
+                yield {"type": "final", **state["result"]}
+                return
+            conversation_id = state["conversation_id"]
+            papers = state["papers"]
+            
+            # Follow-ups and the research summary only depend on the papers, so
+            # build them while the LLM is still decoding
+            post_processing = asyncio.gather(
+                asyncio.to_thread(self._generate_follow_up_questions, papers, query),
+                asyncio.to_thread(self._generate_research_summary, papers, query)
+            )
+            
+            # Step 6: Stream response using OpenAI
+            logger.info("Streaming LLM response with conversation context...")
+            parts = []
+            tokens_used = 0
+            try:
+                async for chunk in self._chat_completion_stream(state["messages"]):
+                    if chunk.get("usage"):
+                        tokens_used = chunk["usage"].get("total_tokens", 0)
+                    choices = chunk.get("choices")
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield {"type": "delta", "delta": delta}
+                
+                follow_up_questions, research_summary = await post_processing
+            finally:
+                # On a client disconnect or stream error the gather is never awaited;
+                # cancel it and retrieve any failure so it isn't logged as unretrieved
+                post_processing.cancel()
+                if post_processing.done() and not post_processing.cancelled():
+                    post_processing.exception()
+            yield {"type": "final", **self._finalize_response(
+                state, "".join(parts), tokens_used, follow_up_questions, research_summary
+            )}
+            
+        except Exception as e:
+            logger.error(f"RAG stream generation failed: {e}")
+            yield {"type": "final", **self._error_response(query, conversation_id, e)}
     
     async def health_check(self) -> Dict[str, Any]:
-        """Check RAG service health."""
+        """Check RAG service health, reusing a recent result to spare the LLM quota."""
+        cached = self._health_cache
+        if cached and time.monotonic() - cached[0] < Config.RAG_HEALTH_CACHE_TTL:
+            return cached[1]
+        
+        # Concurrent probes wait for one in-flight check instead of each calling the LLM
+        if self._health_lock is None:
+            self._health_lock = asyncio.Lock()
+        async with self._health_lock:
+            cached = self._health_cache
+            if cached and time.monotonic() - cached[0] < Config.RAG_HEALTH_CACHE_TTL:
+                return cached[1]
+            
+            result = await self._check_health()
+            self._health_cache = (time.monotonic(), result)
+            return result
+    
+    async def _check_health(self) -> Dict[str, Any]:
+        """Run the live health checks."""
         try:
             # Test OpenAI connection
-            test_response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "Hello"}],
-                max_tokens=10,
-                timeout=5
+            test_response = await self._chat_completion(
+                [{"role": "user", "content": "Hello"}], max_tokens=1, timeout=5, max_retries=1
             )
             
             openai_status = {
                 "connected": True,
                 "model": self.model,
-                "response_received": bool(test_response.choices)
+                "response_received": bool(test_response.get("choices"))
             }
             
         except Exception as e:
@@ -2,10 +2,11 @@
 Search service for handling search operations.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import re
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
 
 from ..models.search import SearchResult, DatabaseStats
 from ..core.config import Config
@@ -14,6 +15,14 @@ from .postgres_service import PostgresService
 
 logger = logging.getLogger(__name__)
 
+# Author extraction patterns. Quantifiers are bounded so unusual front matter
+# cannot trigger runaway backtracking.
+# Numbered author lists like "1 2 3 4 5 Paul Harvey , Bruno Merın , Tracy L. Huard"
+_AUTHOR_PAT = re.compile(r'(?:\d+\s+){1,10}([A-Z][a-zA-Z.\s]{0,200}(?:,\s*[A-Z][a-zA-Z.\s]{0,200}){0,30})')
+# Capitalized names such as "Paul Harvey"
+_NAME_PAT = re.compile(r'[A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,3}')
+_WHITESPACE_PAT = re.compile(r'\s+')
+
 class SearchService:
     """Service for handling search operations."""
     
@@ -21,43 +30,29 @@ class SearchService:
         self.faiss_service = FAISSService()
         self.postgres_service = PostgresService()
     
-    async def search_papers(self, query: str, n_results: int = 5, search_type: str = "faiss") -> List[SearchResult]:
-        """Search papers using FAISS for vector retrieval and PostgreSQL for full details."""
+    async def search_papers(self, query: str, n_results: int = 5, search_type: str = "faiss",
+                            query_embedding: Optional[np.ndarray] = None,
+                            date_range: Optional[Tuple[int, int]] = None) -> List[SearchResult]:
+        """Search papers using FAISS for vector retrieval and PostgreSQL for full details.
+        
+        date_range optionally restricts FAISS hits to an inclusive (first_year, last_year)
+        range of arXiv submission years.
+        """
         try:
             results = []
             
+            # Fan out to both backends so their latencies overlap
+            tasks = []
             if search_type in ["postgres", "both"]:
-                postgres_results = await self.postgres_service.search(query, n_results)
-                results.extend(postgres_results)
-            
+                tasks.append(asyncio.create_task(self.postgres_service.search(query, n_results)))
             if search_type in ["faiss", "both"]:
-                # Use FAISS for vector retrieval
-                faiss_results = await self.faiss_service.search(query, n_results)
-                
-                # Get full paper details from PostgreSQL for each FAISS result
-                enhanced_results = []
-                for result in faiss_results:
-                    if result.paper_id:
-                        # Get full paper details from PostgreSQL
-                        paper_details = await self._get_paper_details(result.paper_id)
-                        if paper_details:
-                            # Update result with full details from PostgreSQL
-                            result.title = paper_details.get('title', result.title)
-                            result.authors = paper_details.get('authors', result.authors)
-                            result.abstract = paper_details.get('abstract', result.abstract)
-                            result.categories = paper_details.get('categories')
-                            result.text_length = paper_details.get('text_length')
-                            result.word_count = paper_details.get('word_count')
-                            result.pdf_path = paper_details.get('pdf_path')
-                            
-                            # Add full text preview from PostgreSQL
-                            full_text = paper_details.get('full_text', '')
-                            if full_text:
-                                result.full_text_preview = full_text[:300] + "..." if len(full_text) > 300 else full_text
-                        
-                        enhanced_results.append(result)
-                
-                results.extend(enhanced_results)
+                tasks.append(asyncio.create_task(self._search_faiss(query, n_results, query_embedding, date_range)))
+            
+            for backend_results in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(backend_results, Exception):
+                    logger.error(f"Search backend failed: {backend_results}")
+                    continue
+                results.extend(backend_results)
             
             # Sort by score and limit results
             results.sort(key=lambda x: x.score, reverse=True)
@@ -67,6 +62,41 @@ class SearchService:
             logger.error(f"Search failed: {e}")
             raise
     
+    async def _search_faiss(self, query: str, n_results: int,
+                            query_embedding: Optional[np.ndarray] = None,
+                            date_range: Optional[Tuple[int, int]] = None) -> List[SearchResult]:
+        """Run FAISS vector retrieval and enrich the hits with PostgreSQL details."""
+        # Use FAISS for vector retrieval
+        faiss_results = await self.faiss_service.search(query, n_results, query_embedding, date_range)
+        
+        # Get full paper details from PostgreSQL for all FAISS results in one query
+        papers = await self._get_papers_details_bulk(
+            [result.paper_id for result in faiss_results if result.paper_id]
+        )
+        
+        enhanced_results = []
+        for result in faiss_results:
+            if result.paper_id:
+                paper_details = papers.get(result.paper_id)
+                if paper_details:
+                    # Update result with full details from PostgreSQL
+                    result.title = paper_details.get('title', result.title)
+                    result.authors = paper_details.get('authors', result.authors)
+                    result.abstract = paper_details.get('abstract', result.abstract)
+                    result.categories = paper_details.get('categories')
+                    result.text_length = paper_details.get('text_length')
+                    result.word_count = paper_details.get('word_count')
+                    result.pdf_path = paper_details.get('pdf_path')
+                    
+                    # Add full text preview from PostgreSQL
+                    full_text = paper_details.get('full_text', '')
+                    if full_text:
+                        result.full_text_preview = full_text[:300] + "..." if len(full_text) > 300 else full_text
+                
+                enhanced_results.append(result)
+        
+        return enhanced_results
+    
     async def get_database_stats(self) -> DatabaseStats:
         """Get database statistics."""
         try:
@@ -75,62 +105,62 @@ class SearchService:
             logger.error(f"Failed to get database stats: {e}")
             raise
     
-    async def _get_paper_details(self, paper_id: str) -> Dict[str, Any]:
-        """Get full paper details from PostgreSQL."""
+    async def _get_papers_details_bulk(self, paper_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get full paper details from PostgreSQL for several papers, keyed by id."""
+        if not paper_ids:
+            return {}
+        
         try:
-            with self.postgres_service.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute("""
+            pool = await self.postgres_service.get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch("""
                     SELECT id, title, authors, abstract, categories, full_text, 
                            text_length, word_count, pdf_path
                     FROM papers 
-                    WHERE id = %s
-                """, (paper_id,))
-                paper = cursor.fetchone()
+                    WHERE id = ANY($1::text[])
+                """, list(set(paper_ids)))
+            
+            papers = {}
+            for row in rows:
+                paper_dict = dict(row)
                 
-                if paper:
-                    paper_dict = dict(paper)
+                # Fix authors if they are incorrect (subtitle instead of actual authors)
+                if paper_dict.get('authors') and paper_dict.get('full_text'):
+                    authors = paper_dict['authors']
+                    full_text = paper_dict['full_text']
                     
-                    # Fix authors if they are incorrect (subtitle instead of actual authors)
-                    if paper_dict.get('authors') and paper_dict.get('full_text'):
-                        authors = paper_dict['authors']
-                        full_text = paper_dict['full_text']
+                    # Check if authors field contains subtitle instead of actual authors
+                    if (authors in full_text[:200] or 
+                        authors == "Unknown Authors" or 
+                        len(authors) > 100):  # Likely a subtitle if too long
                         
-                        # Check if authors field contains subtitle instead of actual authors
-                        if (authors in full_text[:200] or 
-                            authors == "Unknown Authors" or 
-                            len(authors) > 100):  # Likely a subtitle if too long
-                            
-                            # Try to extract real authors from full text
-                            real_authors = self._extract_authors_from_text(full_text)
-                            if real_authors:
-                                paper_dict['authors'] = real_authors
-                                logger.info(f"Fixed authors for {paper_id}: {real_authors[:50]}...")
-                    
-                    return paper_dict
-                return {}
+                        # Try to extract real authors from full text
+                        real_authors = self._extract_authors_from_text(full_text)
+                        if real_authors:
+                            paper_dict['authors'] = real_authors
+                            logger.info(f"Fixed authors for {paper_dict['id']}: {real_authors[:50]}...")
                 
+                papers[paper_dict['id']] = paper_dict
+            return papers
+            
         except Exception as e:
-            logger.error(f"Failed to get paper details for {paper_id}: {e}")
+            logger.error(f"Failed to get paper details for {len(paper_ids)} papers: {e}")
             return {}
     
-    def _extract_authors_from_text(self, full_text: str) -> str:
+    def _extract_authors_from_text(self, full_text: str) -> Optional[str]:
         """Extract real authors from full text."""
         try:
             # Look for common author patterns in the first 1000 characters
             text_start = full_text[:1000]
             
             # Pattern 1: Look for numbered author lists (1 2 3 4 5 Author Name)
-            import re
-            
-            # Find patterns like "1 2 3 4 5 Paul Harvey , Bruno Merın , Tracy L. Huard"
-            author_pattern = r'(?:\d+\s+)+([A-Z][a-zA-Z\s\.]+(?:,\s*[A-Z][a-zA-Z\s\.]+)*)'
-            matches = re.findall(author_pattern, text_start)
+            match = _AUTHOR_PAT.search(text_start)
             
-            if matches:
+            if match:
                 # Take the first match and clean it up
-                authors = matches[0].strip()
+                authors = match.group(1).strip()
                 # Remove extra spaces and clean up
-                authors = re.sub(r'\s+', ' ', authors)
+                authors = _WHITESPACE_PAT.sub(' ', authors)
                 return authors
             
             # Pattern 2: Look for "ABSTRACT" and take text before it
@@ -138,7 +168,7 @@ class SearchService:
             if abstract_pos > 0:
                 before_abstract = text_start[:abstract_pos]
                 # Look for author names (capitalized words)
-                author_names = re.findall(r'[A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*', before_abstract)
+                author_names = _NAME_PAT.findall(before_abstract)
                 if author_names:
                     return ', '.join(author_names[:10])  # Limit to first 10 authors
             
@@ -0,0 +1,50 @@
+"""
+Filtered FAISS search must apply the id selector inside the index scan rather
+than over-fetching and filtering afterwards.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import Config
+from src.services.faiss_indexing import FAISSConfig, FAISSIndexer
+
+DIMENSION = 32
+NUM_VECTORS = 2000
+
+
+def _build_indexer(index_type: str) -> FAISSIndexer:
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((NUM_VECTORS, DIMENSION)).astype('float32')
+    config = FAISSConfig(index_type=index_type, vector_dimension=DIMENSION, ivf_nlist=16,
+                         pq_m=16, train_sample_size=NUM_VECTORS)
+    indexer = FAISSIndexer(config)
+    indexer.add_vectors(vectors, [{'id': i} for i in range(NUM_VECTORS)])
+    return indexer
+
+
+def _no_post_filter(*args, **kwargs):
+    raise AssertionError("filtered search fell back to post-filtering")
+
+
+@pytest.mark.parametrize("index_type", [Config.FAISS_INDEX_TYPE, 'SQ8', 'IVFPQFastScan'])
+def test_filtered_search_uses_selector(index_type, monkeypatch):
+    indexer = _build_indexer(index_type)
+    monkeypatch.setattr(indexer, '_search_post_filtered', _no_post_filter)
+    allowed_ids = np.arange(0, NUM_VECTORS, 97, dtype='int64')
+    query = np.random.default_rng(1).standard_normal(DIMENSION).astype('float32')
+
+    distances, metadata = indexer.search(query, k=5, allowed_ids=allowed_ids)
+
+    returned = [meta['id'] for meta in metadata]
+    assert len(returned) == 5
+    assert set(returned) <= set(allowed_ids.tolist())
+    assert list(distances) == sorted(distances, reverse=True)
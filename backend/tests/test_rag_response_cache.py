@@ -0,0 +1,58 @@
+"""
+The semantic response cache may only reuse answers built with the same
+request settings.
+"""
+
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("aiohttp")
+
+# Add the backend directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import Config
+from src.services.rag_service import RAGService
+
+
+def _cache_only_service() -> RAGService:
+    service = object.__new__(RAGService)
+    service._exact_cache = OrderedDict()
+    service._sem_embs = np.zeros((Config.RAG_CACHE_MAX_SIZE, Config.EMBEDDING_VECTOR_DIMENSION), dtype=np.float32)
+    service._sem_results = [None] * Config.RAG_CACHE_MAX_SIZE
+    service._sem_n_results = np.zeros(Config.RAG_CACHE_MAX_SIZE, dtype=np.int64)
+    service._sem_search_types = np.empty(Config.RAG_CACHE_MAX_SIZE, dtype=object)
+    service._sem_count = 0
+    service._sem_next = 0
+    return service
+
+
+def _unit_vector(seed: int) -> np.ndarray:
+    vector = np.random.default_rng(seed).standard_normal(Config.EMBEDDING_VECTOR_DIMENSION).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.mark.parametrize("n_results, search_type", [(10, "faiss"), (3, "hybrid"), (3, "postgres")])
+def test_semantic_hit_requires_same_settings(n_results, search_type):
+    service = _cache_only_service()
+    embedding = _unit_vector(0)
+    cached = {"response": "cached answer"}
+    service._cache_put("stored-key", embedding, 10, "hybrid", cached)
+
+    # A different exact key forces the lookup through the semantic layer
+    result = service._cache_get("other-key", embedding, n_results, search_type)
+
+    assert result is None
+
+
+def test_semantic_hit_with_same_settings():
+    service = _cache_only_service()
+    embedding = _unit_vector(0)
+    cached = {"response": "cached answer"}
+    service._cache_put("stored-key", embedding, 10, "hybrid", cached)
+
+    assert service._cache_get("other-key", embedding, 10, "hybrid") is cached
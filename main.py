@@ -7,21 +7,68 @@ This script starts both the frontend and backend services for the Deep Research
 It handles process management and provides a unified startup experience.
 """
 
+import functools
+import hashlib
 import os
+import selectors
+import socket
 import sys
 import time
 import signal
 import subprocess
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+# Minimal backend dependency set used when requirements.txt is missing or fails
+BASIC_DEPS = ["fastapi", "uvicorn", "psycopg2-binary", "python-dotenv", "numpy", "pandas", "tqdm", "scikit-learn", "scipy", "faiss-cpu", "openai", "pinecone", "markdown", "reportlab", "arxiv"]
+PIP_INSTALL_SHARDS = 3
+BACKEND_PORT = 8000
+FRONTEND_PORT = 5173
+STARTUP_TIMEOUT = 30  # Seconds to wait for a service to accept connections
+
+# Platform-specific names, resolved once at import
+_IS_WIN = os.name == 'nt'
+_NPM = "npm.cmd" if _IS_WIN else "npm"
+_VENV_BIN = "Scripts" if _IS_WIN else "bin"
+_EXE_SUFFIX = ".exe" if _IS_WIN else ""
+
+# Service command lines (the uvicorn executable is prepended at launch)
+_BACKEND_ARGS = ("app:app", "--host", "0.0.0.0", "--port", str(BACKEND_PORT))
+_FRONTEND_CMD = (_NPM, "run", "dev")
+
+@functools.cache
+def _venv_paths(backend_dir: Path) -> Tuple[Path, Path]:
+    """Return the (python, uvicorn) executables of the backend venv."""
+    venv_bin = backend_dir / "venv" / _VENV_BIN
+    return venv_bin / f"python{_EXE_SUFFIX}", venv_bin / f"uvicorn{_EXE_SUFFIX}"
 
 class ServiceManager:
     """Manages frontend and backend services."""
     
-    def __init__(self):
+    def __init__(self, tail_logs: Optional[bool] = None):
         self.processes: List[subprocess.Popen] = []
         self.running = True
+        # Service output is only piped through the launcher when someone is watching it
+        self.tail_logs = os.environ.get("DRA_TAIL_LOGS") == "1" if tail_logs is None else tail_logs
+        # One selector thread multiplexes every service's output on POSIX
+        self._selector = None if _IS_WIN else selectors.DefaultSelector()
+        self._monitor_thread: Optional[threading.Thread] = None
+        
+        # Resolve the backend venv layout once; start_backend only checks the flags
+        self._venv_python, self._venv_uvicorn = _venv_paths(Path("backend"))
+        self._scan_venv()
+    
+    def _scan_venv(self):
+        """Record which venv executables exist with a single directory scan."""
+        try:
+            with os.scandir(self._venv_python.parent) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            names = set()
+        self._venv_has_python = self._venv_python.name in names
+        self._venv_has_uvicorn = self._venv_uvicorn.name in names
         
     def start_backend(self) -> subprocess.Popen:
         """Start the backend FastAPI server."""
@@ -34,7 +81,8 @@ class ServiceManager:
             
         # Check if virtual environment exists, create if not
         venv_path = backend_dir / "venv"
-        if not venv_path.exists():
+        venv_created = not self._venv_has_python
+        if venv_created:
             print("📦 Creating backend virtual environment...")
             try:
                 subprocess.run([sys.executable, "-m", "venv", "venv"], cwd=str(backend_dir), check=True)
@@ -42,18 +90,29 @@ class ServiceManager:
             except subprocess.CalledProcessError as e:
                 print(f"❌ Failed to create virtual environment: {e}")
                 return None
+            self._scan_venv()
             
         # Activate virtual environment and start server
-        if os.name == 'nt':  # Windows
-            python_exe = venv_path / "Scripts" / "python.exe"
-            uvicorn_exe = venv_path / "Scripts" / "uvicorn.exe"
-        else:  # Unix/Linux/Mac
-            python_exe = venv_path / "bin" / "python"
-            uvicorn_exe = venv_path / "bin" / "uvicorn"
+        python_exe = self._venv_python
+        uvicorn_exe = self._venv_uvicorn
             
-        if not python_exe.exists():
+        if not self._venv_has_python:
             print(f"❌ Python executable not found at {python_exe}")
             return None
+        
+        # Reuse downloaded wheels across cold installs and venv rebuilds
+        pip_env = dict(os.environ, PIP_CACHE_DIR=str((backend_dir / ".pip-cache").resolve()))
+        pip_flags = ["--prefer-binary", "--disable-pip-version-check"]
+        
+        # A fresh venv ships an old pip without wheel, so sdist-only packages would
+        # be rebuilt on every install instead of being cached as wheels
+        if venv_created:
+            print("📦 Upgrading pip, wheel and setuptools...")
+            try:
+                subprocess.run([str(python_exe), "-m", "pip", "install", "-U", "pip", "wheel", "setuptools"] + pip_flags,
+                               cwd=str(backend_dir), check=True, env=pip_env)
+            except subprocess.CalledProcessError as e:
+                print(f"⚠️ Failed to upgrade pip tooling: {e}")
             
         # Create logs directory if it doesn't exist
         logs_dir = backend_dir / "logs"
@@ -66,25 +125,29 @@ class ServiceManager:
         try:
             # Check if requirements.txt exists
             requirements_file = backend_dir / "requirements.txt"
-            if requirements_file.exists():
+            # Hash of the requirements last installed into this venv
+            req_hash_file = venv_path / ".req_hash"
+            req_hash = hashlib.sha256(requirements_file.read_bytes()).hexdigest() if requirements_file.exists() else None
+            # A venv without uvicorn was never fully installed, whatever the stored hash says
+            if (req_hash and self._venv_has_uvicorn and req_hash_file.exists()
+                    and req_hash_file.read_text().strip() == req_hash):
+                print("✅ Backend dependencies up to date, skipping install")
+            elif requirements_file.exists():
                 print("Installing from requirements.txt...")
-                result = subprocess.run([str(python_exe), "-m", "pip", "install", "-r", "requirements.txt"], 
-                                      cwd=str(backend_dir), capture_output=True, text=True)
+                result = subprocess.run([str(python_exe), "-m", "pip", "install", "-r", "requirements.txt"] + pip_flags, 
+                                      cwd=str(backend_dir), capture_output=True, text=True, env=pip_env)
                 if result.returncode == 0:
+                    req_hash_file.write_text(req_hash)
                     print("✅ Backend dependencies installed successfully")
                 else:
                     print(f"⚠️ Some dependencies failed to install, trying basic ones...")
                     print(f"Error: {result.stderr}")
                     # Try installing basic dependencies
-                    basic_deps = ["fastapi", "uvicorn", "psycopg2-binary", "python-dotenv", "numpy", "pandas", "tqdm", "scikit-learn", "scipy", "faiss-cpu", "openai", "pinecone", "markdown", "reportlab", "arxiv"]
-                    subprocess.run([str(python_exe), "-m", "pip", "install"] + basic_deps, 
-                                 cwd=str(backend_dir), check=True)
+                    self._install_basic_deps(python_exe, backend_dir, pip_flags, pip_env)
                     print("✅ Basic dependencies installed")
             else:
                 print("⚠️ No requirements.txt found, installing basic dependencies...")
-                basic_deps = ["fastapi", "uvicorn", "psycopg2-binary", "python-dotenv", "numpy", "pandas", "tqdm", "scikit-learn", "scipy", "faiss-cpu", "openai", "pinecone", "markdown", "reportlab", "arxiv"]
-                subprocess.run([str(python_exe), "-m", "pip", "install"] + basic_deps, 
-                             cwd=str(backend_dir), check=True)
+                self._install_basic_deps(python_exe, backend_dir, pip_flags, pip_env)
                 print("✅ Basic dependencies installed")
         except subprocess.CalledProcessError as e:
             print(f"❌ Failed to install backend dependencies: {e}")
@@ -93,20 +156,20 @@ class ServiceManager:
         try:
             # Start backend with uvicorn
             process = subprocess.Popen(
-                [str(uvicorn_exe), "app:app", "--host", "0.0.0.0", "--port", "8000"],
+                [str(uvicorn_exe), *_BACKEND_ARGS],
                 cwd=str(backend_dir),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1
+                stdout=subprocess.PIPE if self.tail_logs else subprocess.DEVNULL,
+                stderr=subprocess.STDOUT if self.tail_logs else subprocess.DEVNULL,
+                # Flush logs as they are written rather than when the pipe buffer fills
+                env=dict(os.environ, PYTHONUNBUFFERED="1"),
+                close_fds=True,
+                # Own process group, so the service can be stopped as a unit
+                start_new_session=True
             )
             
-            # Start a thread to monitor backend output
-            threading.Thread(
-                target=self._monitor_process,
-                args=(process, "Backend"),
-                daemon=True
-            ).start()
+            # Print backend output alongside the other services
+            if self.tail_logs:
+                self._watch_output(process, "Backend")
             
             print("✅ Backend server started on http://localhost:8000")
             return process
@@ -115,6 +178,29 @@ class ServiceManager:
             print(f"❌ Failed to start backend: {e}")
             return None
     
+    def _install_basic_deps(self, python_exe: Path, backend_dir: Path, pip_flags: List[str], pip_env: dict):
+        """Download BASIC_DEPS in parallel pip shards, then install them with one pip."""
+        pip_cmd = [str(python_exe), "-m", "pip"]
+        wheel_dir = backend_dir / ".pip-cache" / "wheels"
+        shards = [BASIC_DEPS[i::PIP_INSTALL_SHARDS] for i in range(PIP_INSTALL_SHARDS)]
+        
+        def download(deps: List[str]) -> int:
+            return subprocess.run(pip_cmd + ["download", "-d", str(wheel_dir)] + pip_flags + deps,
+                                  cwd=str(backend_dir), capture_output=True, text=True, env=pip_env).returncode
+        
+        # Only downloads run in parallel; concurrent installs into one venv are unsafe
+        with ThreadPoolExecutor(max_workers=PIP_INSTALL_SHARDS) as executor:
+            returncodes = list(executor.map(download, shards))
+        
+        if not any(returncodes):
+            result = subprocess.run(pip_cmd + ["install", "--no-index", "--find-links", str(wheel_dir)]
+                                    + pip_flags + BASIC_DEPS, cwd=str(backend_dir), env=pip_env)
+            if result.returncode == 0:
+                return
+        
+        print("⚠️ Install from downloaded wheels failed, installing from the index...")
+        subprocess.run(pip_cmd + ["install"] + pip_flags + BASIC_DEPS, cwd=str(backend_dir), check=True, env=pip_env)
+    
     def start_frontend(self) -> subprocess.Popen:
         """Start the frontend React development server."""
         print("🎨 Starting Frontend Server...")
@@ -130,8 +216,7 @@ class ServiceManager:
             print("📦 Installing frontend dependencies...")
             try:
                 # Check if npm is available
-                npm_cmd = "npm.cmd" if os.name == 'nt' else "npm"
-                result = subprocess.run([npm_cmd, "install"], cwd=str(frontend_dir), 
+                result = subprocess.run([_NPM, "install"], cwd=str(frontend_dir), 
                                       capture_output=True, text=True, timeout=300)
                 if result.returncode == 0:
                     print("✅ Frontend dependencies installed successfully")
@@ -152,26 +237,19 @@ class ServiceManager:
             
         try:
             # Start frontend with npm
-            if os.name == 'nt':  # Windows
-                npm_cmd = "npm.cmd"
-            else:  # Unix/Linux/Mac
-                npm_cmd = "npm"
-                
             process = subprocess.Popen(
-                [npm_cmd, "run", "dev"],
+                list(_FRONTEND_CMD),
                 cwd=str(frontend_dir),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                bufsize=1
+                stdout=subprocess.PIPE if self.tail_logs else subprocess.DEVNULL,
+                stderr=subprocess.STDOUT if self.tail_logs else subprocess.DEVNULL,
+                close_fds=True,
+                # Own process group, so the service can be stopped as a unit
+                start_new_session=True
             )
             
-            # Start a thread to monitor frontend output
-            threading.Thread(
-                target=self._monitor_process,
-                args=(process, "Frontend"),
-                daemon=True
-            ).start()
+            # Print frontend output alongside the other services
+            if self.tail_logs:
+                self._watch_output(process, "Frontend")
             
             print("✅ Frontend server started on http://localhost:5173")
             return process
@@ -180,15 +258,87 @@ class ServiceManager:
             print(f"❌ Failed to start frontend: {e}")
             return None
     
+    def _watch_output(self, process: subprocess.Popen, service_name: str):
+        """Register a service's output pipe with the shared monitor."""
+        if self._selector is None:
+            # select() only works on sockets on Windows, so each service gets a reader thread
+            threading.Thread(
+                target=self._monitor_process,
+                args=(process, service_name),
+                daemon=True
+            ).start()
+            return
+        
+        fd = process.stdout.fileno()
+        os.set_blocking(fd, False)
+        # [service name, line prefix, unfinished line]
+        self._selector.register(fd, selectors.EVENT_READ, [service_name, f"[{service_name}] ".encode(), b""])
+        if self._monitor_thread is None:
+            self._monitor_thread = threading.Thread(target=self._monitor_outputs, daemon=True)
+            self._monitor_thread.start()
+    
+    @staticmethod
+    def _write_lines(prefix: bytes, lines: List[bytes]):
+        """Write prefixed output lines to stdout as raw bytes in a single write."""
+        sys.stdout.flush()  # Keep ordering with text printed by the launcher
+        out = sys.stdout.buffer
+        out.write(b"".join(prefix + line.strip() + b"\n" for line in lines))
+        out.flush()
+    
     def _monitor_process(self, process: subprocess.Popen, service_name: str):
         """Monitor process output in a separate thread."""
+        prefix = f"[{service_name}] ".encode()
         try:
-            for line in iter(process.stdout.readline, ''):
-                if line:
-                    print(f"[{service_name}] {line.strip()}")
+            for line in iter(process.stdout.readline, b''):
+                self._write_lines(prefix, [line])
         except Exception as e:
             print(f"❌ Error monitoring {service_name}: {e}")
     
+    def _monitor_outputs(self):
+        """Drain every registered service pipe from a single thread."""
+        while self.running:
+            for key, _ in self._selector.select(timeout=0.2):
+                try:
+                    self._drain_output(key)
+                except Exception as e:
+                    print(f"❌ Error monitoring {key.data[0]}: {e}")
+                    self._selector.unregister(key.fd)
+    
+    def _drain_output(self, key: selectors.SelectorKey):
+        """Read one chunk from a ready pipe and write its completed lines."""
+        _, prefix, buffer = key.data
+        try:
+            chunk = os.read(key.fd, 65536)
+        except BlockingIOError:
+            return
+        
+        if not chunk:
+            # EOF: the process closed its output
+            self._selector.unregister(key.fd)
+            if buffer.strip():
+                self._write_lines(prefix, [buffer])
+            return
+        
+        *lines, key.data[2] = (buffer + chunk).split(b'\n')
+        if lines:
+            self._write_lines(prefix, lines)
+    
+    def _wait_for_port(self, process: subprocess.Popen, port: int, service_name: str) -> bool:
+        """Poll until a service accepts TCP connections, it exits, or the startup timeout passes."""
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                print(f"❌ {service_name} exited with code {process.returncode}")
+                return False
+            try:
+                with socket.create_connection(("localhost", port), timeout=0.2):
+                    print(f"✅ {service_name} is accepting connections on port {port}")
+                    return True
+            except OSError:
+                time.sleep(0.05)
+        print(f"⚠️ {service_name} not reachable on port {port} after {STARTUP_TIMEOUT}s, continuing...")
+        return False
+    
     def start_all(self):
         """Start both frontend and backend services."""
         print("🌟 Deep Research Assistant - Starting Services")
@@ -206,9 +356,10 @@ class ServiceManager:
         if backend_process:
             self.processes.append(backend_process)
             print("⏳ Waiting for backend to initialize...")
-            time.sleep(3)  # Give backend time to start
+            self._wait_for_port(backend_process, BACKEND_PORT, "Backend")
         else:
             print("❌ Failed to start backend. Exiting...")
+            self.stop_all()
             return False
             
         # Start frontend
@@ -217,9 +368,10 @@ class ServiceManager:
         if frontend_process:
             self.processes.append(frontend_process)
             print("⏳ Waiting for frontend to initialize...")
-            time.sleep(3)  # Give frontend time to start
+            self._wait_for_port(frontend_process, FRONTEND_PORT, "Frontend")
         else:
             print("❌ Failed to start frontend. Exiting...")
+            self.stop_all()
             return False
             
         print("\n🎉 All services started successfully!")
@@ -229,24 +381,61 @@ class ServiceManager:
         print("📚 API Docs: http://localhost:8000/docs")
         print("🌍 Production: https://2i7mq7kfxp.us-east-1.awsapprunner.com")
         print("=" * 50)
+        if not self.tail_logs:
+            print("Service logs are hidden; set DRA_TAIL_LOGS=1 to show them")
         print("Press Ctrl+C to stop all services")
         print()
         
         return True
     
+    def _signal_service(self, process: subprocess.Popen, force: bool = False):
+        """Terminate (or kill) a service together with the processes it spawned."""
+        try:
+            if _IS_WIN:
+                if force:
+                    process.kill()
+                else:
+                    process.terminate()
+            else:
+                # Services run in their own session, so the process group id is the service pid
+                os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+        except ProcessLookupError:
+            pass  # Already gone
+        except Exception as e:
+            print(f"❌ Error stopping process: {e}")
+    
+    @staticmethod
+    def _service_alive(process: subprocess.Popen) -> bool:
+        """Whether a service or any process left in its process group is still running."""
+        if _IS_WIN:
+            return process.poll() is None
+        process.poll()  # Reap an exited leader so it doesn't count as alive
+        try:
+            # npm can exit while vite/esbuild keep running in its group
+            os.killpg(process.pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+    
     def stop_all(self):
         """Stop all running processes."""
         print("\n🛑 Stopping all services...")
         
+        # Signal every service group first so they shut down concurrently; a group
+        # outlives its leader, so exited leaders are signalled too
         for process in self.processes:
-            if process.poll() is None:  # Process is still running
-                try:
-                    process.terminate()
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                except Exception as e:
-                    print(f"❌ Error stopping process: {e}")
+            self._signal_service(process)
+        
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and any(self._service_alive(process) for process in self.processes):
+            time.sleep(0.05)
+        
+        for process in self.processes:
+            if self._service_alive(process):
+                self._signal_service(process, force=True)
+            process.wait()
         
         print("✅ All services stopped")
         self.running = False
@@ -288,8 +477,7 @@ def main():
     
     # Check Node.js/npm
     try:
-        npm_cmd = "npm.cmd" if os.name == 'nt' else "npm"
-        result = subprocess.run([npm_cmd, "--version"], capture_output=True, text=True)
+        result = subprocess.run([_NPM, "--version"], capture_output=True, text=True)
         if result.returncode == 0:
             print(f"✅ npm {result.stdout.strip()}")
         else: